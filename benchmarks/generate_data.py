@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+##USAGE: python benchmarks/generate_data.py <output_dir> [options]
+#*Example: python benchmarks/generate_data.py bench_data --scale large --seed 7
+
+# Writes synthetic inputs shaped like the real Setaria viridis data for the
+# benchmarks in run_benchmarks.py: a FASTQ file, a CleaveLand full_results.txt,
+# an annotation table with an ID list, a miRNA FASTA with its target tables and
+# a directory of T-plot PDFs. A manifest.json records what was generated.
+
+# Optional Arguments:
+
+# --scale: Preset sizes, small / medium / large (default: small)
+# --reads: Number of FASTQ reads
+# --sites: Number of CleaveLand sites
+# --positions: Degradome positions listed per site
+# --genes: Number of genes in the annotation table
+# --mirnas: Number of miRNAs
+# --targets: Number of miRNA/target rows
+# --pdfs: Number of T-plot PDF files
+# --seed: Random seed (default: 1)
+
+import os
+import sys
+import json
+import random
+import argparse
+
+SCALES = {
+    'small': dict(reads=100_000, sites=2_000, positions=20, genes=5_000, mirnas=200, targets=2_000, pdfs=500),
+    'medium': dict(reads=1_000_000, sites=20_000, positions=30, genes=20_000, mirnas=500, targets=20_000, pdfs=5_000),
+    'large': dict(reads=5_000_000, sites=100_000, positions=40, genes=40_000, mirnas=1_000, targets=100_000, pdfs=20_000),
+}
+
+BASES = 'ACGT'
+
+FUNCTIONS = [
+    'Auxin response factor', 'Squamosa promoter-binding-like protein', 'NAC domain-containing protein',
+    'Homeobox-leucine zipper protein', 'Laccase', 'F-box protein', 'Growth-regulating factor',
+    'Scarecrow-like protein', 'MYB transcription factor', 'Pentatricopeptide repeat-containing protein',
+]
+
+MIRNA_FAMILIES = ['miR156', 'miR159', 'miR160', 'miR164', 'miR166', 'miR167', 'miR169', 'miR171',
+                  'miR172', 'miR390', 'miR396', 'miR398', 'miR399', 'miR528', 'miR529', 'novel']
+
+# Smallest valid PDF; padded to the requested size with a comment
+MINIMAL_PDF = (b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+               b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+               b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+               b"trailer<</Root 1 0 R>>\n%%EOF\n")
+
+def gene_id(n):
+    """Setaria-style gene ID for the n-th gene (Sevir.<chr>G<number>)."""
+    return f"Sevir.{n % 9 + 1}G{(n // 9 + 1) * 100:06d}"
+
+def mirna_chr_id(n):
+    """Chromosome-position miRNA ID as used in the target tables (e.g. Chr09_45260)."""
+    return f"Chr{n % 9 + 1:02d}_{10_000 + n * 37}"
+
+def random_sequence(rng, length):
+    return ''.join(rng.choices(BASES, k=length))
+
+def write_fastq(path, n_reads, rng, min_length=18, max_length=36):
+    """Write n_reads Illumina-style FASTQ records with small RNA/degradome read lengths."""
+    # A pool of distinct sequences, reused so the file has realistic duplication
+    pool = [random_sequence(rng, rng.randint(min_length, max_length)) for _ in range(max(1, n_reads // 5))]
+    with open(path, 'w', buffering=1 << 20) as f:
+        for n in range(n_reads):
+            seq = rng.choice(pool)
+            f.write(f"@SRR000001.{n + 1} length={len(seq)}\n{seq}\n+\n{'I' * len(seq)}\n")
+    return path
+
+def write_cleaveland_results(path, n_sites, positions_per_site, n_genes, n_mirnas, rng):
+    """Write a CleaveLand full_results.txt with n_sites records in the layout the filter parses."""
+    with open(path, 'w', buffering=1 << 20) as f:
+        f.write("# CleaveLand4 Combined Results\n# Synthetic benchmark data\n")
+        f.write("----------------------------------------\n")
+        for n in range(n_sites):
+            target = f"{gene_id(rng.randrange(n_genes))}.1"
+            mirna = mirna_chr_id(rng.randrange(n_mirnas))
+            site = rng.randint(50, 3000)
+            mfe_perfect = round(rng.uniform(-45, -30), 1)
+            mfe_site = round(mfe_perfect * rng.uniform(0.5, 1.0), 1)
+            category = rng.choices(range(5), weights=[10, 5, 20, 30, 35])[0]
+
+            f.write(f"SiteID: {target}:{site}\n")
+            f.write(f"MFE of perfect match: {mfe_perfect}\n")
+            f.write(f"MFE of this site: {mfe_site}\n")
+            f.write(f"MFEratio: {round(mfe_site / mfe_perfect, 3)}\n")
+            f.write(f"Allen et al. score: {rng.choice([0, 0.5, 1, 1.5, 2, 2.5, 3, 4, 5, 6, 7])}\n")
+            f.write("Paired Regions\n")
+            f.write(f"    {site - 10}-{site + 10}\n")
+            f.write("Unpaired Regions\n")
+            f.write(f"    {site - 12}-{site - 11}\n")
+            f.write("Degardome data file: degradome_density.txt\n")
+            f.write(f"Degardome Category: {category}\n")
+            f.write(f"Degardome p-value: {rng.choice([0.001, 0.005, 0.01, 0.03, 0.05, 0.1, 0.3, 0.8])}\n")
+            f.write(f"T-Plot file: cleaveland_results/{mirna}_{target}_{site}_TPlot.pdf\n")
+            f.write("\nPosition\tReads\tCategory\n")
+            positions = sorted(set(rng.sample(range(1, 3500), positions_per_site - 1)) | {site})
+            for position in positions:
+                reads = rng.randint(20, 200) if position == site else rng.randint(1, 30)
+                f.write(f"{position}\t{reads}\t{category if position == site else rng.randint(2, 4)}\n")
+            f.write("\n" + "-" * 50 + "\n\n")
+    return path
+
+def write_annotation_table(path, n_genes, rng):
+    """Write a tab-separated annotation table with the ID in column 1 and a Function column."""
+    with open(path, 'w', buffering=1 << 20) as f:
+        f.write("Locus\tSetaria viridis ID\tFunction\tGO terms\tArabidopsis hit\n")
+        for n in range(n_genes):
+            f.write(f"locus_{n}\t{gene_id(n)}\t{rng.choice(FUNCTIONS)}\t"
+                    f"GO:{rng.randint(1, 99999):07d}\tAT{rng.randint(1, 5)}G{rng.randint(1, 80000):05d}\n")
+    return path
+
+def write_id_list(path, n_ids, n_genes, rng):
+    """Write transcript IDs (with variant numbers) for filter_ids_annotation."""
+    with open(path, 'w') as f:
+        for n in rng.sample(range(n_genes), min(n_ids, n_genes)):
+            f.write(f"{gene_id(n)}.{rng.randint(1, 3)}\n")
+    return path
+
+def write_mirna_files(fasta_path, targets_path, sankey_path, n_mirnas, n_targets, n_genes, rng):
+    """
+    Write a miRNA FASTA, a miRNA/target table (input of miRNA_mapping_script)
+    and a miRNA ID/Gene table (input of filter_script_for_sankey).
+    """
+    with open(fasta_path, 'w') as f:
+        for n in range(n_mirnas):
+            f.write(f">{rng.choice(MIRNA_FAMILIES)}_{mirna_chr_id(n)}\n{random_sequence(rng, rng.randint(20, 24))}\n")
+
+    with open(targets_path, 'w', buffering=1 << 20) as targets, open(sankey_path, 'w', buffering=1 << 20) as sankey:
+        targets.write("miRNA ID\tTarget ID\n")
+        sankey.write("Original miRNA ID\tmiRNA_Chr ID\tmiRNA ID\tTarget ID\tGene\n")
+        for _ in range(n_targets):
+            n = rng.randrange(n_mirnas)
+            family = MIRNA_FAMILIES[n % len(MIRNA_FAMILIES)]
+            gene = gene_id(rng.randrange(n_genes))
+            targets.write(f"{mirna_chr_id(n)}\t{gene}.1\n")
+            sankey.write(f"{mirna_chr_id(n)}\t{family}_{mirna_chr_id(n)}\t{family}\t{gene}.1\t{gene}\n")
+    return fasta_path, targets_path, sankey_path
+
+def write_tplot_pdfs(pdf_dir, n_pdfs, n_genes, n_mirnas, rng, size_bytes=4096):
+    """Write n_pdfs small PDFs named like CleaveLand's T-plots."""
+    os.makedirs(pdf_dir, exist_ok=True)
+    padding = b"%" + b"x" * max(0, size_bytes - len(MINIMAL_PDF) - 2) + b"\n"
+    for _ in range(n_pdfs):
+        name = f"{mirna_chr_id(rng.randrange(n_mirnas))}_{gene_id(rng.randrange(n_genes))}.1_{rng.randint(50, 3000)}_TPlot.pdf"
+        with open(os.path.join(pdf_dir, name), 'wb') as f:
+            f.write(MINIMAL_PDF[:9] + padding + MINIMAL_PDF[9:])
+    return pdf_dir
+
+def generate_all(output_dir, reads, sites, positions, genes, mirnas, targets, pdfs, seed=1):
+    """Generate every benchmark input in output_dir and return the manifest."""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+
+    files = {
+        'fastq': write_fastq(os.path.join(output_dir, 'reads.fastq'), reads, rng),
+        'cleaveland_results': write_cleaveland_results(
+            os.path.join(output_dir, 'full_results.txt'), sites, positions, genes, mirnas, rng),
+        'annotation': write_annotation_table(os.path.join(output_dir, 'annotation_table.tsv'), genes, rng),
+        'id_list': write_id_list(os.path.join(output_dir, 'id_list.txt'), max(1, genes // 10), genes, rng),
+        'tplot_dir': write_tplot_pdfs(os.path.join(output_dir, 'tplots'), pdfs, genes, mirnas, rng),
+    }
+    files['mirna_fasta'], files['target_table'], files['sankey_table'] = write_mirna_files(
+        os.path.join(output_dir, 'miRNA.fasta'), os.path.join(output_dir, 'miRNA_table.txt'),
+        os.path.join(output_dir, 'miRNA_output.txt'), mirnas, targets, genes, rng)
+
+    manifest = {
+        'seed': seed,
+        'sizes': dict(reads=reads, sites=sites, positions=positions, genes=genes,
+                      mirnas=mirnas, targets=targets, pdfs=pdfs),
+        'files': {key: os.path.relpath(path, output_dir) for key, path in files.items()},
+    }
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def add_size_arguments(parser):
+    """Options shared with run_benchmarks.py to choose the data sizes."""
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help='Preset sizes (default: small)')
+    for name in SCALES['small']:
+        parser.add_argument(f'--{name}', type=int, help=f'Override the number of {name}')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+
+def sizes_from_args(args):
+    sizes = dict(SCALES[args.scale])
+    for name in sizes:
+        if getattr(args, name) is not None:
+            sizes[name] = getattr(args, name)
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic inputs for the benchmarks')
+    parser.add_argument('output_dir', help='Directory to write the data to')
+    add_size_arguments(parser)
+
+    args = parser.parse_args()
+
+    manifest = generate_all(args.output_dir, seed=args.seed, **sizes_from_args(args))
+    print(f"Generated benchmark data in {args.output_dir}:", file=sys.stderr)
+    for key, value in manifest['sizes'].items():
+        print(f"- {key}: {value}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
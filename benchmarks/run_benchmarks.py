@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+##USAGE: python benchmarks/run_benchmarks.py [options]
+#*Example: python benchmarks/run_benchmarks.py --scale medium --repeats 3 --output bench_before.json
+#*Example: python benchmarks/run_benchmarks.py --scale medium --data_dir bench_data --compare bench_before.json
+
+# Measures throughput and peak memory of the Python entry points on synthetic data
+# from generate_data.py. Every run happens in a fresh interpreter, so peak RSS is
+# that of a single call and earlier benchmarks cannot warm caches for later ones.
+# Results are written as JSON; --compare prints the change against an earlier file.
+
+# Optional Arguments:
+
+# --data_dir: Reuse (or create) benchmark data here instead of a temporary directory
+# --benchmarks: Only run these benchmarks (default: all)
+# --repeats: Runs per benchmark; the median is reported (default: 3)
+# --output: Results file (default: benchmarks/results/<timestamp>.json)
+# --compare: Earlier results file to compare against
+# --scale / --reads / --sites / ...: Data sizes, see generate_data.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from statistics import median
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_data import add_size_arguments, sizes_from_args, generate_all
+
+def bench_fastq_to_fasta(data, work_dir):
+    from ptpipeline.fastq_to_fasta import fastq_to_fasta
+    source = data['fastq']
+    yield
+    fastq_to_fasta(source, os.path.join(work_dir, 'reads.fasta'))
+    yield data['sizes']['reads'], os.path.getsize(source)
+
+def bench_filter_cleaveland_output(data, work_dir):
+    from ptpipeline.filter_cleaveland_results import filter_cleaveland_output
+    source = data['cleaveland_results']
+    yield
+    filter_cleaveland_output(source, os.path.join(work_dir, 'filtered_results.txt'),
+                             min_mfe_ratio=0.7, max_pvalue=0.05)
+    yield data['sizes']['sites'], os.path.getsize(source)
+
+def bench_extract_ids_from_cleaveland(data, work_dir):
+    from ptpipeline.filter_cleaveland_results import extract_ids_from_cleaveland
+    source = data['cleaveland_results']
+    yield
+    extract_ids_from_cleaveland(source)
+    yield data['sizes']['sites'], os.path.getsize(source)
+
+def bench_filter_and_copy_pdfs(data, work_dir):
+    from ptpipeline.filter_cleaveland_results import extract_ids_from_cleaveland, filter_and_copy_pdfs
+    ids = extract_ids_from_cleaveland(data['cleaveland_results'])
+    pdf_dir = data['tplot_dir']
+    total_bytes = sum(entry.stat().st_size for entry in os.scandir(pdf_dir))
+    yield
+    filter_and_copy_pdfs(ids, pdf_dir, os.path.join(work_dir, 'matched_pdfs'))
+    yield data['sizes']['pdfs'], total_bytes
+
+def bench_process_table_to_stdout(data, work_dir):
+    from ptpipeline.mirna_mapping_script import parse_fasta, process_table_to_stdout
+    mapping = parse_fasta(data['mirna_fasta'])
+    source = data['target_table']
+    yield
+    process_table_to_stdout(source, mapping)
+    yield data['sizes']['targets'], os.path.getsize(source)
+
+def bench_filter_ids_annotation(data, work_dir):
+    # run() imports pandas lazily; import it here so its import time is not measured
+    import pandas
+    from ptpipeline.filter_ids_annotation import add_arguments, run
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    args = parser.parse_args(['-i', data['id_list'], '-a', data['annotation'],
+                              '-o', os.path.join(work_dir, 'filtered_annotation.tsv'), '--no_console'])
+    yield
+    run(args)
+    yield data['sizes']['genes'], os.path.getsize(data['annotation'])
+
+def bench_process_files(data, work_dir):
+    from ptpipeline.filter_script_for_sankey import process_files
+    source = data['sankey_table']
+    yield
+    process_files(source, data['annotation'], os.path.join(work_dir, 'sankey_table.tsv'))
+    yield data['sizes']['targets'], os.path.getsize(source) + os.path.getsize(data['annotation'])
+
+# Each benchmark is a generator: code before the first yield is setup and is not
+# timed; the second yield reports (records, bytes) processed by the timed call.
+BENCHMARKS = {
+    'fastq_to_fasta': bench_fastq_to_fasta,
+    'filter_cleaveland_output': bench_filter_cleaveland_output,
+    'extract_ids_from_cleaveland': bench_extract_ids_from_cleaveland,
+    'filter_and_copy_pdfs': bench_filter_and_copy_pdfs,
+    'process_table_to_stdout': bench_process_table_to_stdout,
+    'filter_ids_annotation': bench_filter_ids_annotation,
+    'process_files': bench_process_files,
+}
+
+def run_child(name, data_dir):
+    """Run one benchmark in this process and print its measurements as JSON."""
+    import resource
+
+    sys.path.insert(0, REPO_DIR)
+    with open(os.path.join(data_dir, 'manifest.json'), 'r') as f:
+        manifest = json.load(f)
+    data = {key: os.path.join(data_dir, path) for key, path in manifest['files'].items()}
+    data['sizes'] = manifest['sizes']
+
+    work_dir = tempfile.mkdtemp(prefix=f"bench_{name}_")
+    real_stdout = sys.stdout
+    try:
+        # The scripts print progress (some per row); that cost is part of the benchmark
+        sys.stdout = open(os.devnull, 'w')
+        steps = BENCHMARKS[name](data, work_dir)
+        next(steps)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        records, n_bytes = next(steps)
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    json.dump({
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'records': records,
+        'bytes': n_bytes,
+        'rss_before_kb': rss_before,
+        'peak_rss_kb': peak_rss,
+    }, sys.stdout)
+
+def run_benchmark(name, data_dir, repeats):
+    """Run a benchmark repeats times in fresh interpreters and summarize the runs."""
+    runs = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name, data_dir],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit status {result.returncode}"
+            return {'error': error}
+        runs.append(json.loads(result.stdout))
+
+    wall = median(run['wall_seconds'] for run in runs)
+    records, n_bytes = runs[0]['records'], runs[0]['bytes']
+    return {
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(median(run['cpu_seconds'] for run in runs), 4),
+        'records': records,
+        'bytes': n_bytes,
+        'records_per_second': round(records / wall, 1) if wall else None,
+        'mb_per_second': round(n_bytes / wall / 1e6, 2) if wall else None,
+        'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+        'rss_before_kb': min(run['rss_before_kb'] for run in runs),
+        'runs': [round(run['wall_seconds'], 4) for run in runs],
+    }
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+def print_comparison(results, previous):
+    """Print wall time and peak RSS changes against an earlier results file."""
+    print("\nComparison with previous run:")
+    for name, current in results['benchmarks'].items():
+        before = previous.get('benchmarks', {}).get(name)
+        if not before or 'error' in before or 'error' in current:
+            print(f"  {name:<28} n/a")
+            continue
+        time_change = (current['wall_seconds'] / before['wall_seconds'] - 1) * 100 if before['wall_seconds'] else 0
+        rss_change = (current['peak_rss_kb'] / before['peak_rss_kb'] - 1) * 100 if before['peak_rss_kb'] else 0
+        print(f"  {name:<28} time {time_change:+6.1f}%   peak RSS {rss_change:+6.1f}%")
+    if previous.get('sizes') != results['sizes']:
+        print("  Note: the data sizes differ between the two runs")
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description='Benchmark the Python entry points on synthetic data')
+    parser.add_argument('--data_dir', help='Reuse (or create) benchmark data in this directory')
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), help='Only run these benchmarks')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per benchmark (default: 3)')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    add_size_arguments(parser)
+
+    args = parser.parse_args()
+    sizes = sizes_from_args(args)
+
+    temp_data = args.data_dir is None
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='bench_data_')
+    manifest_file = os.path.join(data_dir, 'manifest.json')
+    try:
+        manifest = None
+        if os.path.isfile(manifest_file):
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+        if not manifest or manifest['sizes'] != sizes or manifest['seed'] != args.seed:
+            print(f"Generating benchmark data in {data_dir}...")
+            manifest = generate_all(data_dir, seed=args.seed, **sizes)
+
+        results = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': manifest['sizes'],
+            'seed': manifest['seed'],
+            'repeats': args.repeats,
+            'benchmarks': {},
+        }
+
+        for name in args.benchmarks or BENCHMARKS:
+            result = run_benchmark(name, data_dir, args.repeats)
+            results['benchmarks'][name] = result
+            if 'error' in result:
+                print(f"{name:<28} skipped: {result['error']}")
+            else:
+                print(f"{name:<28} {result['wall_seconds']:8.3f}s  {result['records_per_second']:>12,.0f} rec/s  "
+                      f"{result['mb_per_second']:7.2f} MB/s  peak RSS {result['peak_rss_kb'] / 1024:7.1f} MB")
+    finally:
+        if temp_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    output = args.output or os.path.join(BENCH_DIR, 'results', time.strftime('%Y%m%d_%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            print_comparison(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# Kept so existing workflows can still call this script directly.
+# The code lives in ptpipeline/build_degradome_density.py and is also available as: ptp degradome-density
+
+from ptpipeline.build_degradome_density import main
+
+if __name__ == "__main__":
+    main()
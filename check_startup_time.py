@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+##USAGE: python check_startup_time.py [options]
+#*Example: python check_startup_time.py --max_seconds 0.3 --repeats 5
+
+# Startup-time regression check for the ptp command line. For every subcommand it
+# times "python -m ptpipeline <command> --help" and checks with -X importtime that
+# none of the heavy optional dependencies are loaded just to print the help.
+# Exits with status 1 if a command is too slow or imports a heavy module, so it
+# can be run before merging changes to the scripts.
+
+# Optional Arguments:
+
+# --max_seconds: Maximum median wall time per command (default: 0.5)
+# --repeats: Number of timed runs per command (default: 5)
+# --commands: Only check these subcommands (default: all)
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from statistics import median
+
+from ptpipeline.cli import COMMANDS
+
+# Modules that must only be imported by the code paths that need them
+HEAVY_MODULES = {'pandas', 'numpy', 'tabulate', 'matplotlib', 'yaml'}
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def command_env():
+    """Environment that makes the package importable from this checkout."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_DIR, env.get('PYTHONPATH')]))
+    return env
+
+def time_command(command, repeats):
+    """Return the median wall time of 'ptp <command> --help' over several runs."""
+    cmd = [sys.executable, '-m', 'ptpipeline', command, '--help']
+    env = command_env()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    return median(timings)
+
+def heavy_imports(command):
+    """Return the heavy top-level modules imported by 'ptp <command> --help'."""
+    cmd = [sys.executable, '-X', 'importtime', '-m', 'ptpipeline', command, '--help']
+    result = subprocess.run(cmd, env=command_env(), stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=True)
+    found = set()
+    for line in result.stderr.splitlines():
+        # Lines look like: "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        module = line.rsplit('|', 1)[1].strip().split('.')[0]
+        if module in HEAVY_MODULES:
+            found.add(module)
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that ptp subcommands start quickly')
+    parser.add_argument('--max_seconds', type=float, default=0.5, help='Maximum median wall time per command (default: 0.5)')
+    parser.add_argument('--repeats', type=int, default=5, help='Number of timed runs per command (default: 5)')
+    parser.add_argument('--commands', nargs='+', choices=sorted(COMMANDS), help='Only check these subcommands')
+
+    args = parser.parse_args()
+
+    failures = 0
+    for command in args.commands or COMMANDS:
+        elapsed = time_command(command, args.repeats)
+        heavy = heavy_imports(command)
+
+        problems = []
+        if elapsed > args.max_seconds:
+            problems.append(f"slower than {args.max_seconds:.2f}s")
+        if heavy:
+            problems.append(f"imports {', '.join(sorted(heavy))}")
+
+        status = 'FAIL' if problems else 'ok'
+        detail = f" ({'; '.join(problems)})" if problems else ''
+        print(f"{status:<4} {command:<20} {elapsed:.3f}s{detail}")
+        failures += bool(problems)
+
+    if failures:
+        print(f"\n{failures} command(s) failed the startup check")
+        sys.exit(1)
+    print("\nAll commands passed the startup check")
+
+if __name__ == "__main__":
+    main()
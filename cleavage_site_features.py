@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# Kept so existing workflows can still call this script directly.
+# The code lives in ptpipeline/cleavage_site_features.py and is also available as: ptp site-features
+
+from ptpipeline.cleavage_site_features import main
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,16 @@ CLEAVELAND_PATH="/path/to/your/directory/CleaveLand4.pl"  # <-- ADD THIS LINE to
 LOG_FILE="cleaveland_run_$(date +%Y%m%d_%H%M%S).log"
 PROGRESS_FILE="cleaveland_progress.tmp"
 DEGRADOME_FILE="degradome_reads.fasta"
+DENSITY_FILE=""  # Optional density file CleaveLand4 wrote in mode 1 (degradome_cache/<key>_cleaveland_dd.txt); uses CleaveLand4 mode 2 when set
 SMALL_RNA_FILE="Svi_small_reads.fasta"
 TRANSCRIPTOME_FILE="transcriptome_reads.fasta"
 OUTPUT_DIR="cleaveland_results"  # Directory to store results
 OUTPUT_FILE="$OUTPUT_DIR/full_results.txt"  # Consolidated results file
+PROGRESS_JSON="$OUTPUT_DIR/progress.json"  # Machine-readable progress for dashboards
+MONITOR_SCRIPT="$(dirname "$0")/monitor_cleaveland_progress.py"
+DENSITY_SCRIPT="$(dirname "$0")/build_degradome_density.py"
+DENSITY_CACHE_DIR="degradome_cache"  # Where the density file written by a mode 1 run is cached for reuse with -d
+RENDER_TPLOTS=false  # Set to true to skip CleaveLand4's PDF T-plots (-o) and render only the filtered ones with filter-cleaveland --render-tplots
 DEBUG=true  # Set to true for additional debugging information
 
 # Clean up any previous progress file
@@ -24,14 +30,31 @@ echo "Starting CleaveLand4 run at $(date)" | tee -a "$LOG_FILE"
 echo "Parameters:" | tee -a "$LOG_FILE"
 echo "  CleaveLand4 path: $CLEAVELAND_PATH" | tee -a "$LOG_FILE"
 echo "  Degradome file: $DEGRADOME_FILE" | tee -a "$LOG_FILE"
+echo "  Density file: ${DENSITY_FILE:-none (density computed from degradome reads)}" | tee -a "$LOG_FILE"
 echo "  Small RNA file: $SMALL_RNA_FILE" | tee -a "$LOG_FILE"
 echo "  Transcriptome file: $TRANSCRIPTOME_FILE" | tee -a "$LOG_FILE"
 echo "  Output directory: $OUTPUT_DIR" | tee -a "$LOG_FILE"
+echo "  CleaveLand4 T-plots: $([ "$RENDER_TPLOTS" = true ] && echo "off (render filtered ones later)" || echo "on")" | tee -a "$LOG_FILE"
 echo "  Log file: $LOG_FILE" | tee -a "$LOG_FILE"
 echo "----------------------------------------" | tee -a "$LOG_FILE"
 
+# Use the precomputed density file instead of the raw reads when one is configured
+if [ -n "$DENSITY_FILE" ]; then
+    case "$DENSITY_FILE" in
+        *_bowtie_dd.txt)
+            echo "Warning: $DENSITY_FILE was rebuilt with bowtie, not written by CleaveLand4;" | tee -a "$LOG_FILE"
+            echo "         use a *_cleaveland_dd.txt cache entry unless it passed build_degradome_density.py --compare" | tee -a "$LOG_FILE"
+            ;;
+    esac
+    DEGRADOME_INPUT=(-d "$DENSITY_FILE")
+    DEGRADOME_INPUT_FILE="$DENSITY_FILE"
+else
+    DEGRADOME_INPUT=(-e "$DEGRADOME_FILE")
+    DEGRADOME_INPUT_FILE="$DEGRADOME_FILE"
+fi
+
 # Verify input files exist
-for file in "$CLEAVELAND_PATH" "$DEGRADOME_FILE" "$SMALL_RNA_FILE" "$TRANSCRIPTOME_FILE"; do
+for file in "$CLEAVELAND_PATH" "$DEGRADOME_INPUT_FILE" "$SMALL_RNA_FILE" "$TRANSCRIPTOME_FILE"; do
     if [ ! -f "$file" ]; then
         echo "ERROR: File not found: $file" | tee -a "$LOG_FILE"
         exit 1
@@ -60,7 +83,7 @@ echo "----------------------------------------" | tee -a "$LOG_FILE"
 if [ "$DEBUG" = true ]; then
     echo "DEBUG: Checking file formats..." | tee -a "$LOG_FILE"
     echo "First 5 lines of degradome file:" | tee -a "$LOG_FILE"
-    head -n 5 "$DEGRADOME_FILE" | tee -a "$LOG_FILE"
+    head -n 5 "$DEGRADOME_INPUT_FILE" | tee -a "$LOG_FILE"
     echo "First 5 lines of small RNA file:" | tee -a "$LOG_FILE"
     head -n 5 "$SMALL_RNA_FILE" | tee -a "$LOG_FILE"
     echo "First 5 lines of transcriptome file:" | tee -a "$LOG_FILE"
@@ -115,20 +138,38 @@ monitor_progress() {
 }
 
 # Start the progress monitor in background
-monitor_progress &
+# Prefer the Python monitor, which tails the log from its last offset instead of
+# re-scanning the whole file, and fall back to the shell loop if it is unavailable
+touch "$PROGRESS_FILE"
+if command -v python3 &> /dev/null && [ -f "$MONITOR_SCRIPT" ]; then
+    python3 "$MONITOR_SCRIPT" \
+        --log "$LOG_FILE" \
+        --total_srna "$TOTAL_SMALL_RNA" \
+        --total_transcripts "$TOTAL_TRANSCRIPTS" \
+        --stop_file "$PROGRESS_FILE" \
+        --json "$PROGRESS_JSON" \
+        --start_time "$START_TIME" &
+else
+    monitor_progress &
+fi
 MONITOR_PID=$!
 
 # Build the CleaveLand4 command with all necessary parameters
 CLEAVELAND_CMD=(
     "$CLEAVELAND_PATH"
-    -e "$DEGRADOME_FILE"
+    "${DEGRADOME_INPUT[@]}"
     -u "$SMALL_RNA_FILE"
     -n "$TRANSCRIPTOME_FILE"
     -p 1  # P-value cutoff
     -c 4  # Category cutoff
-    -o "$OUTPUT_DIR"  # Output directory
 )
 
+# CleaveLand4 writes a PDF T-plot for every candidate site when given -o; with
+# RENDER_TPLOTS the plots are drawn afterwards for the filtered sites only
+if [ "$RENDER_TPLOTS" != true ]; then
+    CLEAVELAND_CMD+=(-o "$OUTPUT_DIR")  # Output directory for T-plots
+fi
+
 # Run CleaveLand4 with proper parameters
 echo "Running CleaveLand4 with command:" | tee -a "$LOG_FILE"
 echo "${CLEAVELAND_CMD[@]}" | tee -a "$LOG_FILE"
@@ -140,9 +181,20 @@ echo "----------------------------------------" | tee -a "$LOG_FILE"
 # Signal end of monitoring
 rm -f "$PROGRESS_FILE"
 
-# Allow the monitor thread to print final stats and terminate
-sleep 1
-kill $MONITOR_PID &>/dev/null
+# Let the monitor notice the missing progress file, print final stats and exit
+wait $MONITOR_PID 2>/dev/null
+
+# In mode 1 CleaveLand4 writes the density file it computed next to the run;
+# cache that file so later runs can use it with DENSITY_FILE (mode 2)
+if [ -z "$DENSITY_FILE" ]; then
+    for dd_file in "${DEGRADOME_FILE}_dd.txt" "$(basename "$DEGRADOME_FILE")_dd.txt"; do
+        if [ -f "$dd_file" ] && command -v python3 &> /dev/null && [ -f "$DENSITY_SCRIPT" ]; then
+            python3 "$DENSITY_SCRIPT" "$DEGRADOME_FILE" "$TRANSCRIPTOME_FILE" \
+                --cache_dir "$DENSITY_CACHE_DIR" --from-cleaveland "$dd_file" 2>&1 | tee -a "$LOG_FILE"
+            break
+        fi
+    done
+fi
 
 END_TIME=$(date +%s)
 RUNTIME=$((END_TIME - START_TIME))
@@ -262,3 +314,8 @@ if [ -f "$OUTPUT_DIR/cleaveland_output.txt" ]; then
 fi
 
 echo "Analysis complete. Check $OUTPUT_FILE for detailed results."
+
+if [ "$RENDER_TPLOTS" = true ]; then
+    echo "T-plots were not written by CleaveLand4. Render them for the filtered sites with:"
+    echo "python $(dirname "$0")/filter-cleaveland-results.py $OUTPUT_FILE --render-tplots [filters]"
+fi
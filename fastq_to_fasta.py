@@ -1,18 +1,8 @@
 #!/usr/bin/env python3
-import sys
+# Kept so existing workflows can still call this script directly.
+# The code lives in ptpipeline/fastq_to_fasta.py and is also available as: ptp fastq-to-fasta
 
-def fastq_to_fasta(input_file, output_file):
-    with open(input_file, 'r') as fin, open(output_file, 'w') as fout:
-        line_count = 0
-        for line in fin:
-            line_count += 1
-            if line_count % 4 == 1:  # Header line in FASTQ
-                fout.write('>' + line[1:])  # Replace @ with > for FASTA
-            elif line_count % 4 == 2:  # Sequence line in FASTQ
-                fout.write(line)
+from ptpipeline.fastq_to_fasta import main
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python fastq_to_fasta.py input.fastq output.fasta")
-        sys.exit(1)
-    fastq_to_fasta(sys.argv[1], sys.argv[2])
\ No newline at end of file
+    main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# Kept so existing workflows can still call this script directly.
+# The code lives in ptpipeline/monitor_cleaveland_progress.py and is also available as: ptp monitor-progress
+
+from ptpipeline.monitor_cleaveland_progress import main
+
+if __name__ == "__main__":
+    main()
@@ -66,4 +66,7 @@ echo "Conversion complete. $READ_COUNT reads written to $OUTPUT_FASTA"
 echo "=== Processing complete ==="
 echo "You can now use $OUTPUT_FASTA as input for CleaveLand4 mode 1 with:"
 echo "CleaveLand4.pl -e $OUTPUT_FASTA -u small_RNA_queries.fasta -n transcriptome.fasta -t > full_results.txt"
-                                                                                                                            
\ No newline at end of file
+echo "To reuse the degradome density across runs, cache the ${OUTPUT_FASTA}_dd.txt file CleaveLand4 writes in mode 1:"
+echo "python build_degradome_density.py $OUTPUT_FASTA transcriptome.fasta --from-cleaveland ${OUTPUT_FASTA}_dd.txt --output degradome_density.txt"
+echo "and run CleaveLand4 in mode 2 with -d degradome_density.txt instead of -e"
+                                                                                                                            
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Scripts for the small RNA and degradome analysis of Setaria viridis.
+
+Every module can be run on its own or through the ``ptp`` command (see cli.py).
+Modules are only imported when their subcommand is used.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+
+##USAGE: ptp degradome-density <degradome.fasta> <transcriptome.fasta> [options]
+#    or: python build_degradome_density.py <degradome.fasta> <transcriptome.fasta> [options]
+#*Example: python build_degradome_density.py degradome_reads.fasta transcriptome_reads.fasta --cache_dir degradome_cache --output degradome_density.txt
+
+# Caches a CleaveLand4 degradome density file under a key derived from the
+# content of the degradome reads and the transcriptome, so later CleaveLand4
+# runs can use mode 2 (-d) instead of re-aligning the raw degradome reads.
+#
+# The preferred source is the density file CleaveLand4 itself writes in mode 1
+# (<degradome file>_dd.txt): pass it with --from-cleaveland and it is stored
+# unchanged as <key>_cleaveland_dd.txt. Without it the file is rebuilt here
+# with bowtie, following CleaveLand4's rules, and stored as <key>_bowtie_dd.txt;
+# check such a build once against CleaveLand4's own file with --compare before
+# relying on it, since any difference changes the categories and p-values of
+# mode 2.
+
+# Required Arguments:
+
+# degradome_fasta: FASTA file with degradome reads (output of prepare_degradome_mode1.sh)
+# transcriptome_fasta: FASTA file with transcript sequences
+
+# Optional Arguments:
+
+# --cache_dir: Directory holding cached density files and bowtie indexes (default: degradome_cache)
+# --output: Also copy the density file to this path
+# --threads: Number of bowtie threads (default: 1)
+# --force: Rebuild the density file even if a cached copy exists
+# --from-cleaveland: Cache this density file written by CleaveLand4 mode 1 instead of building one
+# --compare: Compare the density file with one written by CleaveLand4 and exit 1 if they differ
+
+import os
+import sys
+import shutil
+import hashlib
+import tempfile
+import subprocess
+from statistics import median
+
+from . import profiling
+
+DESCRIPTION = 'Build and cache a CleaveLand4 degradome density file'
+
+PROFILE_OUTPUT_ARG = 'output'
+
+# Bumped whenever the density computation changes so old cache entries are not reused
+DENSITY_FORMAT_VERSION = "1"
+
+# Where a cached density file came from: CleaveLand4 mode 1 (--from-cleaveland)
+# or the bowtie rebuild in this script. Each source has its own cache entries.
+DENSITY_SOURCES = ('cleaveland', 'bowtie')
+
+def file_sha256(file_path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def density_cache_key(reads_hash, transcriptome_hash, source):
+    """Combine input hashes, the density source and the format version into one cache key."""
+    if source not in DENSITY_SOURCES:
+        raise ValueError(f"Unknown density source '{source}'")
+    digest = hashlib.sha256()
+    for part in (DENSITY_FORMAT_VERSION, source, reads_hash, transcriptome_hash):
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+def collapse_reads(degradome_fasta, collapsed_fasta):
+    """
+    Collapse identical degradome reads into one FASTA entry each.
+
+    Headers are written as >read<N>_x<count> so the original abundance
+    can be restored after alignment.
+
+    Returns:
+        Tuple of (total reads, unique reads)
+    """
+    counts = {}
+    total = 0
+
+    with open(degradome_fasta, 'r') as f:
+        seq_parts = []
+        for line in f:
+            if line.startswith('>'):
+                if seq_parts:
+                    seq = ''.join(seq_parts).upper()
+                    counts[seq] = counts.get(seq, 0) + 1
+                    total += 1
+                    seq_parts = []
+            else:
+                seq_parts.append(line.strip())
+        if seq_parts:
+            seq = ''.join(seq_parts).upper()
+            counts[seq] = counts.get(seq, 0) + 1
+            total += 1
+
+    with open(collapsed_fasta, 'w') as out:
+        for n, (seq, count) in enumerate(counts.items(), start=1):
+            out.write(f">read{n}_x{count}\n{seq}\n")
+
+    return total, len(counts)
+
+def read_transcript_lengths(transcriptome_fasta):
+    """Return a dict mapping transcript IDs (first header word) to sequence length."""
+    lengths = {}
+    current_id = None
+
+    with open(transcriptome_fasta, 'r') as f:
+        for line in f:
+            if line.startswith('>'):
+                current_id = line[1:].split()[0]
+                lengths[current_id] = 0
+            elif current_id is not None:
+                lengths[current_id] += len(line.strip())
+
+    return lengths
+
+def bowtie_index_complete(index_base):
+    """Return True if bowtie-build finished writing the index at index_base."""
+    # bowtie-build writes the .rev.2 file last; small and large indexes use .ebwt and .ebwtl
+    return any(os.path.isfile(f"{index_base}.rev.2.{suffix}") for suffix in ('ebwt', 'ebwtl'))
+
+def ensure_bowtie_index(transcriptome_fasta, index_dir):
+    """
+    Build a bowtie index for the transcriptome unless a complete one exists.
+
+    The index is built in a private directory next to index_dir and renamed
+    into place when bowtie-build succeeds, so a killed build never leaves a
+    partial index behind and a concurrent run never aligns against one.
+    """
+    index_base = os.path.join(index_dir, 'transcriptome')
+    if bowtie_index_complete(index_base):
+        print(f"Reusing bowtie index in {index_dir}")
+        return index_base
+
+    parent_dir = os.path.dirname(index_dir) or '.'
+    os.makedirs(parent_dir, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(index_dir)}_", suffix='.partial', dir=parent_dir)
+    try:
+        print(f"Building bowtie index in {index_dir}")
+        subprocess.run(['bowtie-build', '-q', '-f', transcriptome_fasta, os.path.join(build_dir, 'transcriptome')],
+                       check=True, stdout=subprocess.DEVNULL)
+
+        if os.path.isdir(index_dir) and not bowtie_index_complete(index_base):
+            # Left behind by a killed build from before indexes were renamed into place
+            shutil.rmtree(index_dir)
+        try:
+            os.replace(build_dir, index_dir)
+        except OSError:
+            # Another run renamed its index into place first; use that one
+            if not bowtie_index_complete(index_base):
+                raise
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+    return index_base
+
+def align_reads(collapsed_fasta, index_base, threads=1):
+    """
+    Align collapsed reads to the sense strand of the transcriptome with bowtie.
+
+    Settings follow CleaveLand4's own degradome alignment (up to one mismatch,
+    best hits only, no reverse-complement matches).
+
+    Yields:
+        Tuples of (transcript ID, 1-based 5' position, read count)
+    """
+    cmd = ['bowtie', '-f', '-v', '1', '--best', '--strata', '-k', '50', '--norc',
+           '-p', str(threads), index_base, collapsed_fasta]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+
+    for line in proc.stdout:
+        parts = line.rstrip('\n').split('\t')
+        if len(parts) < 4:
+            continue
+        read_name, _strand, transcript_id, offset = parts[:4]
+        count = int(read_name.rsplit('_x', 1)[1])
+        yield transcript_id, int(offset) + 1, count
+
+    if proc.wait() != 0:
+        raise RuntimeError(f"bowtie exited with status {proc.returncode}")
+
+def categorize_positions(position_reads):
+    """
+    Assign CleaveLand4 degradome categories to each position on a transcript.
+
+    0: >1 read, the single maximum on the transcript
+    1: >1 read, tied for the maximum
+    2: >1 read, above the median but below the maximum
+    3: >1 read, at or below the median
+    4: exactly 1 read
+    """
+    values = list(position_reads.values())
+    max_reads = max(values)
+    n_at_max = values.count(max_reads)
+    median_reads = median(values)
+
+    categories = {}
+    for position, reads in position_reads.items():
+        if reads == 1:
+            categories[position] = 4
+        elif reads == max_reads:
+            categories[position] = 0 if n_at_max == 1 else 1
+        elif reads > median_reads:
+            categories[position] = 2
+        else:
+            categories[position] = 3
+    return categories
+
+def write_density_file(density, lengths, output_file, degradome_fasta, transcriptome_fasta):
+    """Write per-transcript read densities in CleaveLand4 density file layout."""
+    with open(output_file, 'w') as f:
+        f.write("# CleaveLand4 degradome density file\n")
+        f.write(f"# Degradome: {os.path.basename(degradome_fasta)}\n")
+        f.write(f"# Transcriptome: {os.path.basename(transcriptome_fasta)}\n")
+        for transcript_id in sorted(density):
+            position_reads = density[transcript_id]
+            categories = categorize_positions(position_reads)
+            f.write(f"@ID:{transcript_id}\n")
+            f.write(f"@LN:{lengths.get(transcript_id, 0)}\n")
+            for position in sorted(position_reads):
+                f.write(f"{position}\t{position_reads[position]}\t{categories[position]}\n")
+
+def build_degradome_density(degradome_fasta, transcriptome_fasta, cache_dir='degradome_cache',
+                            threads=1, force=False):
+    """
+    Return the path of a cached bowtie-built density file for these inputs,
+    building it if needed.
+
+    The cache key is derived from the content of both FASTA files, so renamed or
+    copied inputs hit the same cache entry and edited inputs never do.
+    """
+    for file_path in (degradome_fasta, transcriptome_fasta):
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Input file '{file_path}' does not exist")
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    print("Hashing input files...")
+    with profiling.stage('hash') as stage:
+        reads_hash = file_sha256(degradome_fasta)
+        transcriptome_hash = file_sha256(transcriptome_fasta)
+        stage.add(bytes=os.path.getsize(degradome_fasta) + os.path.getsize(transcriptome_fasta))
+    key = density_cache_key(reads_hash, transcriptome_hash, 'bowtie')
+    density_file = os.path.join(cache_dir, f"{key}_bowtie_dd.txt")
+
+    if os.path.isfile(density_file) and not force:
+        print(f"Cache hit: {density_file}")
+        return density_file
+
+    # A private work directory, so concurrent builds of the same inputs do not share files
+    work_dir = tempfile.mkdtemp(prefix=f"tmp_{key[:16]}_", dir=cache_dir)
+    try:
+        collapsed_fasta = os.path.join(work_dir, 'collapsed_reads.fasta')
+        with profiling.stage('collapse') as stage:
+            total, unique = collapse_reads(degradome_fasta, collapsed_fasta)
+            stage.add(records=total, bytes=os.path.getsize(degradome_fasta))
+        print(f"Collapsed {total} degradome reads to {unique} unique sequences")
+
+        index_dir = os.path.join(cache_dir, f"index_{transcriptome_hash[:16]}")
+        with profiling.stage('index'):
+            index_base = ensure_bowtie_index(transcriptome_fasta, index_dir)
+
+        density = {}
+        aligned = 0
+        with profiling.stage('align') as stage:
+            for transcript_id, position, count in align_reads(collapsed_fasta, index_base, threads):
+                positions = density.setdefault(transcript_id, {})
+                positions[position] = positions.get(position, 0) + count
+                aligned += 1
+            stage.add(records=unique, bytes=os.path.getsize(collapsed_fasta))
+        print(f"Recorded {aligned} alignments on {len(density)} transcripts")
+
+        with profiling.stage('write') as stage:
+            lengths = read_transcript_lengths(transcriptome_fasta)
+
+            # Write inside the work directory first so an interrupted run never leaves a partial cache entry
+            partial_file = os.path.join(work_dir, 'density.partial')
+            write_density_file(density, lengths, partial_file, degradome_fasta, transcriptome_fasta)
+            os.replace(partial_file, density_file)
+            stage.add(records=len(density), bytes=os.path.getsize(density_file))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"Density file written to {density_file}")
+    return density_file
+
+def density_cache_path(degradome_fasta, transcriptome_fasta, cache_dir, source='cleaveland'):
+    """Return the cache path of the density file from source for these inputs."""
+    for file_path in (degradome_fasta, transcriptome_fasta):
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"Input file '{file_path}' does not exist")
+    key = density_cache_key(file_sha256(degradome_fasta), file_sha256(transcriptome_fasta), source)
+    return os.path.join(cache_dir, f"{key}_{source}_dd.txt")
+
+def read_density_file(density_file):
+    """
+    Parse a CleaveLand4 density file.
+
+    Returns:
+        Dict mapping transcript IDs to (length, {position: (reads, category)})
+    """
+    lengths = {}
+    positions = {}
+    current_id = None
+    with open(density_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('@ID:'):
+                current_id = line[4:].strip()
+                positions[current_id] = {}
+                lengths[current_id] = None
+            elif line.startswith('@LN:') and current_id is not None:
+                lengths[current_id] = int(line[4:])
+            else:
+                fields = line.split()
+                if current_id is None or len(fields) != 3:
+                    raise ValueError(f"{density_file}: unexpected line '{line}'")
+                position, reads, category = (int(float(value)) for value in fields)
+                positions[current_id][position] = (reads, category)
+    return {transcript_id: (lengths[transcript_id], positions[transcript_id]) for transcript_id in positions}
+
+def compare_density_files(density_file, reference_file, max_reported=20):
+    """
+    Compare a density file with a reference written by CleaveLand4.
+
+    Returns:
+        List of human-readable differences (empty if the files agree)
+    """
+    ours = read_density_file(density_file)
+    reference = read_density_file(reference_file)
+    differences = []
+
+    for transcript_id in sorted(set(ours) | set(reference)):
+        if transcript_id not in ours:
+            differences.append(f"{transcript_id}: missing (reference has {len(reference[transcript_id][1])} positions)")
+            continue
+        if transcript_id not in reference:
+            differences.append(f"{transcript_id}: not in reference ({len(ours[transcript_id][1])} positions)")
+            continue
+        (length, positions), (ref_length, ref_positions) = ours[transcript_id], reference[transcript_id]
+        if length != ref_length:
+            differences.append(f"{transcript_id}: length {length}, reference {ref_length}")
+        for position in sorted(set(positions) | set(ref_positions)):
+            if positions.get(position) != ref_positions.get(position):
+                differences.append(f"{transcript_id}:{position}: (reads, category) {positions.get(position)}, "
+                                   f"reference {ref_positions.get(position)}")
+
+    if len(differences) > max_reported:
+        differences = differences[:max_reported] + [f"... and {len(differences) - max_reported} more"]
+    return differences
+
+def import_density_file(cleaveland_density_file, degradome_fasta, transcriptome_fasta, cache_dir='degradome_cache'):
+    """
+    Store a density file written by CleaveLand4 mode 1 in the cache for these inputs.
+
+    The file is checked to parse as a density file and then copied unchanged.
+    """
+    if not os.path.isfile(cleaveland_density_file):
+        raise FileNotFoundError(f"Density file '{cleaveland_density_file}' does not exist")
+    read_density_file(cleaveland_density_file)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    density_file = density_cache_path(degradome_fasta, transcriptome_fasta, cache_dir, source='cleaveland')
+
+    # Copy to a private temporary name first so an interrupted or concurrent run never leaves a partial cache entry
+    fd, partial_file = tempfile.mkstemp(prefix='import_', suffix='.partial', dir=cache_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(cleaveland_density_file, partial_file)
+        os.replace(partial_file, density_file)
+    finally:
+        if os.path.exists(partial_file):
+            os.remove(partial_file)
+
+    print(f"Cached CleaveLand4 density file as {density_file}")
+    return density_file
+
+def add_arguments(parser):
+    parser.add_argument('degradome_fasta', help='FASTA file with degradome reads (from prepare_degradome_mode1.sh)')
+    parser.add_argument('transcriptome_fasta', help='FASTA file with transcript sequences')
+    parser.add_argument('--cache_dir', default='degradome_cache', help='Directory for cached density files (default: degradome_cache)')
+    parser.add_argument('--output', help='Also copy the density file to this path')
+    parser.add_argument('--threads', type=int, default=1, help='Number of bowtie threads (default: 1)')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if a cached density file exists')
+    parser.add_argument('--from-cleaveland', help='Cache this density file written by CleaveLand4 mode 1 instead of building one')
+    parser.add_argument('--compare', help='Compare the density file with one written by CleaveLand4; exit 1 if they differ')
+
+def run(args):
+    try:
+        if args.from_cleaveland:
+            density_file = import_density_file(
+                args.from_cleaveland,
+                args.degradome_fasta,
+                args.transcriptome_fasta,
+                cache_dir=args.cache_dir
+            )
+        else:
+            density_file = build_degradome_density(
+                args.degradome_fasta,
+                args.transcriptome_fasta,
+                cache_dir=args.cache_dir,
+                threads=args.threads,
+                force=args.force
+            )
+        differences = compare_density_files(density_file, args.compare) if args.compare else []
+    except (FileNotFoundError, ValueError, RuntimeError, subprocess.CalledProcessError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+
+    if args.compare:
+        if differences:
+            sys.stderr.write(f"Density file differs from {args.compare}:\n")
+            for difference in differences:
+                sys.stderr.write(f"  {difference}\n")
+            sys.exit(1)
+        print(f"Density file matches {args.compare}")
+
+    if args.output:
+        shutil.copyfile(density_file, args.output)
+        print(f"Copied density file to {args.output}")
+
+    if not args.from_cleaveland and not args.compare:
+        print("This density file was rebuilt with bowtie; check it with --compare before using it for mode 2")
+    print("Use it with CleaveLand4 mode 2:")
+    print(f"CleaveLand4.pl -d {args.output or density_file} -u small_RNA_queries.fasta -n {args.transcriptome_fasta} -t > full_results.txt")
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('degradome-density', argv)
+
+if __name__ == "__main__":
+    main()
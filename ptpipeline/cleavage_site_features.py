@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+##USAGE: ptp site-features <filtered_results.txt> <annotation.gff3> [options]
+#    or: python cleavage_site_features.py <filtered_results.txt> <annotation.gff3> [options]
+#*Example: python cleavage_site_features.py filtered_results.txt Sviridis_726_v4.1.gene.gff3 --output cleavage_site_features.tsv
+
+# Annotates each CleaveLand cleavage site with the transcript feature it falls in
+# (5'UTR, CDS or 3'UTR). CleaveLand positions are transcript coordinates, so the
+# GFF3 exon/CDS/UTR segments are converted to transcript coordinates once and
+# stored as sorted arrays per transcript; each lookup is then a binary search.
+# The index is pickled in the cache directory, keyed on the GFF3 content hash.
+
+# Required Arguments:
+
+# filtered_results: filtered_results.txt written by filter-cleaveland-results.py
+# gff3: Genome annotation in GFF3 format
+
+# Optional Arguments:
+
+# --output: Output TSV file (default: cleavage_site_features.tsv)
+# --cache_dir: Directory for the cached feature index (default: gff_index_cache)
+
+import os
+import sys
+import pickle
+import tempfile
+from bisect import bisect_right
+
+from . import profiling
+from .build_degradome_density import file_sha256
+
+DESCRIPTION = "Annotate CleaveLand sites with the 5'UTR/CDS/3'UTR feature they fall in"
+
+PROFILE_OUTPUT_ARG = 'output'
+
+# Bumped whenever the index layout changes so old cache entries are not reused
+INDEX_FORMAT_VERSION = "1"
+
+FEATURE_LABELS = {
+    'five_prime_UTR': "5'UTR",
+    'CDS': 'CDS',
+    'three_prime_UTR': "3'UTR",
+}
+
+TRANSCRIPT_TYPES = {'mRNA', 'transcript'}
+
+def parse_attributes(field):
+    """Parse a GFF3 attribute column into a dict."""
+    attributes = {}
+    for item in field.strip().split(';'):
+        if '=' in item:
+            key, value = item.split('=', 1)
+            attributes[key] = value
+    return attributes
+
+def read_gff3_segments(gff_file):
+    """
+    Collect genomic segments per transcript from a GFF3 file.
+
+    Returns:
+        Tuple of (transcripts, aliases) where transcripts maps a transcript ID to
+        {'strand', 'span', 'exons', 'features'} and aliases maps Name attributes to IDs
+    """
+    transcripts = {}
+    aliases = {}
+
+    def transcript_entry(transcript_id):
+        return transcripts.setdefault(transcript_id, {'strand': '+', 'span': None, 'exons': [], 'features': []})
+
+    with open(gff_file, 'r') as f:
+        for line in f:
+            if line.startswith('#') or not line.strip():
+                continue
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 9:
+                continue
+
+            feature_type, start, end, strand = parts[2], int(parts[3]), int(parts[4]), parts[6]
+            attributes = parse_attributes(parts[8])
+
+            if feature_type in TRANSCRIPT_TYPES and 'ID' in attributes:
+                entry = transcript_entry(attributes['ID'])
+                entry['strand'] = strand
+                entry['span'] = (start, end)
+                if 'Name' in attributes:
+                    aliases[attributes['Name']] = attributes['ID']
+            elif feature_type == 'exon' or feature_type in FEATURE_LABELS:
+                for parent in attributes.get('Parent', '').split(','):
+                    if not parent:
+                        continue
+                    entry = transcript_entry(parent)
+                    entry['strand'] = strand
+                    if feature_type == 'exon':
+                        entry['exons'].append((start, end))
+                    else:
+                        entry['features'].append((start, end, FEATURE_LABELS[feature_type]))
+
+    return transcripts, aliases
+
+def to_transcript_intervals(strand, exons, features, span=None):
+    """
+    Convert genomic feature segments to sorted transcript-coordinate intervals.
+
+    Transcripts without exon records use their CDS/UTR segments as exons, extended
+    to the transcript span when one is known. When a transcript has a CDS but no
+    UTR records, the UTRs are inferred from the exon sequence before and after
+    the CDS.
+
+    Returns:
+        Tuple of (starts, ends, labels) lists sorted by start
+    """
+    if not exons:
+        exons = [(start, end) for start, end, _label in features]
+        if exons and span:
+            first, last = min(e[0] for e in exons), max(e[1] for e in exons)
+            if span[0] < first:
+                exons.append((span[0], first - 1))
+            if span[1] > last:
+                exons.append((last + 1, span[1]))
+    if not exons:
+        return [], [], []
+
+    # Merge overlapping exon segments, then order them 5' to 3'
+    merged = []
+    for start, end in sorted(exons):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    ordered = merged if strand != '-' else list(reversed(merged))
+
+    offsets = []
+    offset = 0
+    for start, end in ordered:
+        offsets.append((start, end, offset))
+        offset += end - start + 1
+    transcript_length = offset
+
+    def genomic_to_transcript(position):
+        for start, end, exon_offset in offsets:
+            if start <= position <= end:
+                if strand == '-':
+                    return exon_offset + (end - position) + 1
+                return exon_offset + (position - start) + 1
+        return None
+
+    intervals = []
+    for start, end, label in features:
+        tx_a, tx_b = genomic_to_transcript(start), genomic_to_transcript(end)
+        if tx_a is None or tx_b is None:
+            continue
+        intervals.append((min(tx_a, tx_b), max(tx_a, tx_b), label))
+
+    labels = {label for _start, _end, label in intervals}
+    if labels == {'CDS'}:
+        cds_start = min(start for start, _end, _label in intervals)
+        cds_end = max(end for _start, end, _label in intervals)
+        if cds_start > 1:
+            intervals.append((1, cds_start - 1, "5'UTR"))
+        if cds_end < transcript_length:
+            intervals.append((cds_end + 1, transcript_length, "3'UTR"))
+
+    intervals.sort()
+    return [i[0] for i in intervals], [i[1] for i in intervals], [i[2] for i in intervals]
+
+class FeatureIndex:
+    """Sorted-array index of transcript features in transcript coordinates."""
+
+    def __init__(self, intervals, aliases):
+        self.intervals = intervals
+        self.aliases = aliases
+
+    @classmethod
+    def from_gff3(cls, gff_file):
+        transcripts, aliases = read_gff3_segments(gff_file)
+        intervals = {}
+        for transcript_id, entry in transcripts.items():
+            starts, ends, labels = to_transcript_intervals(entry['strand'], entry['exons'], entry['features'],
+                                                           entry['span'])
+            if starts:
+                intervals[transcript_id] = (starts, ends, labels)
+        return cls(intervals, aliases)
+
+    def lookup(self, transcript_id, position):
+        """
+        Return the feature label overlapping a 1-based transcript position.
+
+        Returns 'unknown_transcript' if the transcript is not in the GFF3 and
+        'none' if the position is outside every annotated feature.
+        """
+        transcript_id = self.aliases.get(transcript_id, transcript_id)
+        if transcript_id not in self.intervals:
+            return 'unknown_transcript'
+
+        starts, ends, labels = self.intervals[transcript_id]
+        i = bisect_right(starts, position) - 1
+        if i >= 0 and position <= ends[i]:
+            return labels[i]
+        return 'none'
+
+def load_feature_index(gff_file, cache_dir='gff_index_cache'):
+    """Load the feature index for a GFF3 file from the cache, building it if needed."""
+    if not os.path.isfile(gff_file):
+        raise FileNotFoundError(f"GFF3 file '{gff_file}' does not exist")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_file = os.path.join(cache_dir, f"{file_sha256(gff_file)[:32]}_v{INDEX_FORMAT_VERSION}.pkl")
+
+    # Plain dicts are pickled rather than the class, so the cache loads the same
+    # whether this file runs as a script or is imported by another one
+    if os.path.isfile(cache_file):
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        return FeatureIndex(cached['intervals'], cached['aliases'])
+
+    index = FeatureIndex.from_gff3(gff_file)
+
+    # Write to a private temporary name first so an interrupted or concurrent run
+    # (site-features and target-modules may share the cache) never leaves a partial entry
+    fd, partial_file = tempfile.mkstemp(suffix='.partial', dir=cache_dir)
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump({'intervals': index.intervals, 'aliases': index.aliases}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(partial_file, cache_file)
+    print(f"Feature index for {len(index.intervals)} transcripts cached in {cache_file}", file=sys.stderr)
+
+    return index
+
+def split_site_id(site_id):
+    """Split a CleaveLand SiteID (target:position) into (target, position)."""
+    target, _, position = site_id.rpartition(':')
+    if not target or not position.isdigit():
+        return site_id, None
+    return target, int(position)
+
+def annotate_sites(filtered_results, index, output_file):
+    """Write one row per SiteID in filtered_results with its overlapping feature."""
+    count = 0
+    with open(filtered_results, 'r') as infile, open(output_file, 'w') as outfile:
+        outfile.write("SiteID\tTarget ID\tPosition\tFeature\n")
+        for line in infile:
+            if not line.startswith("SiteID:"):
+                continue
+            site_id = line.split("SiteID:", 1)[1].strip()
+            target, position = split_site_id(site_id)
+            feature = index.lookup(target, position) if position is not None else 'none'
+            outfile.write(f"{site_id}\t{target}\t{position if position is not None else 'NA'}\t{feature}\n")
+            count += 1
+
+    return count
+
+def add_arguments(parser):
+    parser.add_argument('filtered_results', help='filtered_results.txt from filter-cleaveland-results.py')
+    parser.add_argument('gff3', help='Genome annotation in GFF3 format')
+    parser.add_argument('--output', default='cleavage_site_features.tsv', help='Output TSV file (default: cleavage_site_features.tsv)')
+    parser.add_argument('--cache_dir', default='gff_index_cache', help='Directory for the cached feature index (default: gff_index_cache)')
+
+def run(args):
+    try:
+        with profiling.stage('load_index') as stage:
+            index = load_feature_index(args.gff3, args.cache_dir)
+            stage.add(records=len(index.intervals), bytes=os.path.getsize(args.gff3))
+        with profiling.stage('annotate') as stage:
+            count = annotate_sites(args.filtered_results, index, args.output)
+            stage.add(records=count, bytes=os.path.getsize(args.filtered_results))
+    except FileNotFoundError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+
+    print(f"Annotated {count} cleavage sites, written to {args.output}")
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('site-features', argv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#USAGE: ptp <command> [options]     (ptp --help lists the commands, ptp <command> --help their options)
+#   or: python -m ptpipeline <command> [options]
+
+# Single entry point for the pipeline scripts. Only the module of the requested
+# subcommand is imported, and each module imports its heavy dependencies
+# (pandas, tabulate, matplotlib, PyYAML) inside the code that needs them, so
+# "--help" and small runs start quickly even on a slow shared filesystem.
+# Every command also accepts --profile (see profiling.py).
+
+import sys
+import importlib
+
+# Subcommand name -> (module, one-line help)
+COMMANDS = {
+    'fastq-to-fasta': ('ptpipeline.fastq_to_fasta', 'Convert a FASTQ file to FASTA'),
+    'degradome-density': ('ptpipeline.build_degradome_density', 'Build and cache a CleaveLand4 degradome density file'),
+    'monitor-progress': ('ptpipeline.monitor_cleaveland_progress', 'Monitor CleaveLand4 progress by tailing its log'),
+    'filter-cleaveland': ('ptpipeline.filter_cleaveland_results', 'Filter CleaveLand results, extract IDs and copy or render T-plots'),
+    'site-features': ('ptpipeline.cleavage_site_features', "Annotate cleavage sites with 5'UTR/CDS/3'UTR from a GFF3"),
+    'target-modules': ('ptpipeline.mirna_target_modules', 'Extract miRNA/target modules from filtered CleaveLand results'),
+    'mirna-mapping': ('ptpipeline.mirna_mapping_script', 'Add miRNA names and types to a miRNA/target table'),
+    'filter-annotation': ('ptpipeline.filter_ids_annotation', 'Filter an annotation table by a list of IDs'),
+    'sankey-table': ('ptpipeline.filter_script_for_sankey', 'Join miRNA targets with gene functions for the Sankey table'),
+    'run-pipeline': ('ptpipeline.run_pipeline', 'Run the pipeline with stage-level caching'),
+}
+
+def print_usage(stream=sys.stdout):
+    stream.write("usage: ptp <command> [options]\n\n")
+    stream.write("Commands:\n")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_module, help_text) in COMMANDS.items():
+        stream.write(f"  {name:<{width}}  {help_text}\n")
+    stream.write("\nRun 'ptp <command> --help' for the options of a command.\n")
+
+def run_command(command, argv=None, prog=None):
+    """
+    Parse the arguments of one command and run it, with --profile support.
+
+    Used by "ptp <command>" and by each module's own main(), so every entry
+    point shares the same argument handling.
+    """
+    # argparse is only needed once a command has been chosen
+    import argparse
+    from .profiling import add_profile_arguments, profiling_requested
+
+    module_name, help_text = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    parser = argparse.ArgumentParser(prog=prog, description=getattr(module, 'DESCRIPTION', help_text))
+    module.add_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if not profiling_requested(args):
+        module.run(args)
+        return
+
+    from .profiling import Profiler, summary_path
+    output_file = summary_path(args, command, getattr(module, 'PROFILE_OUTPUT_ARG', None))
+    with Profiler(command, output_file, dump_file=args.profile_dump,
+                  trace_memory=args.profile_memory, argv=argv):
+        module.run(args)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+    if argv[0] == '--version':
+        from . import __version__
+        print(f"ptp {__version__}")
+        return
+
+    command = argv[0]
+    if command not in COMMANDS:
+        sys.stderr.write(f"ptp: unknown command '{command}'\n\n")
+        print_usage(sys.stderr)
+        sys.exit(2)
+
+    run_command(command, argv[1:], prog=f"ptp {command}")
+
+if __name__ == "__main__":
+    main()
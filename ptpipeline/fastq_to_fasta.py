@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+#USAGE: ptp fastq-to-fasta input.fastq output.fasta
+#   or: python fastq_to_fasta.py input.fastq output.fasta
+
+import os
+
+from . import profiling
+
+DESCRIPTION = 'Convert a FASTQ file to FASTA'
+
+PROFILE_OUTPUT_ARG = 'output_fasta'
+
+def fastq_to_fasta(input_file, output_file):
+    with profiling.stage('convert') as stage, open(input_file, 'r') as fin, open(output_file, 'w') as fout:
+        line_count = 0
+        for line in fin:
+            line_count += 1
+            if line_count % 4 == 1:  # Header line in FASTQ
+                fout.write('>' + line[1:])  # Replace @ with > for FASTA
+            elif line_count % 4 == 2:  # Sequence line in FASTQ
+                fout.write(line)
+        stage.add(records=line_count // 4, bytes=os.path.getsize(input_file))
+
+def add_arguments(parser):
+    parser.add_argument('input_fastq', help='Input FASTQ file')
+    parser.add_argument('output_fasta', help='Output FASTA file')
+
+def run(args):
+    fastq_to_fasta(args.input_fastq, args.output_fasta)
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('fastq-to-fasta', argv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+
+##USAGE: ptp filter-cleaveland <input_file> --pdf_dir <pdf_directory> [options]
+#    or: python filter-cleaveland-results.py <input_file> --pdf_dir <pdf_directory> [options]
+#*Example: python filter-cleaveland-results.py full_results.txt --pdf_dir ./pdf_files --min-mfe-ratio 0.7 --max-allen-score 5 --max-pvalue 0.05 --category 0 1 2
+
+# Required Arguments:
+
+# input_file: Path to the original CleaveLand full_results.txt file
+# --pdf_dir: Directory containing PDF files to be filtered
+
+# Optional Arguments:
+
+# --min-mfe-ratio: Minimum MFE ratio to keep (e.g., 0.7)
+# --max-allen-score: Maximum Allen et al. score to keep (e.g., 5)
+# --category: Degradome categories to keep (e.g., 0 1 2)
+# --max-pvalue: Maximum p-value to keep (e.g., 0.05)
+# --output_dir: Directory to copy matching PDFs to (default: matched_pdfs)
+# --render-tplots: Draw T-plots for the filtered records instead of copying CleaveLand's PDFs (--pdf_dir not needed)
+# --tplot-format: Format of rendered T-plots, pdf or png (default: pdf)
+# --workers: Number of processes used to render T-plots (default: all CPUs)
+
+import os
+import re
+import sys
+import shutil
+
+from . import profiling
+
+DESCRIPTION = 'Integrated CleaveLand workflow: filter results, extract IDs, and copy or render T-plots'
+
+# Colors for degradome categories 0-4 in rendered T-plots
+TPLOT_CATEGORY_COLORS = ['#d62728', '#ff7f0e', '#2ca02c', '#1f77b4', '#7f7f7f']
+
+# Suffixes tplot_name strips from T-Plot file lines
+TPLOT_EXTENSIONS = ('.pdf', '.png')
+
+def parse_cleaveland_output(file_path):
+    """Parse the CleaveLand output file and return a list of records."""
+    records = []
+    current_record = {}
+
+    with open(file_path, 'r') as f:
+        lines = f.readlines()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+
+        # Start of a new record
+        if line.startswith("SiteID:"):
+            if current_record:
+                records.append(current_record)
+                current_record = {}
+
+            # Parse site ID
+            current_record['site_id'] = line.split("SiteID:")[1].strip()
+
+        # Parse MFE values
+        elif line.startswith("MFE of perfect match:"):
+            current_record['mfe_perfect'] = float(line.split(":")[1].strip())
+        elif line.startswith("MFE of this site:"):
+            current_record['mfe_site'] = float(line.split(":")[1].strip())
+        elif line.startswith("MFEratio:"):
+            current_record['mfe_ratio'] = float(line.split(":")[1].strip())
+
+        # Parse Allen score
+        elif line.startswith("Allen et al. score:"):
+            current_record['allen_score'] = float(line.split(":")[1].strip())
+
+        # Parse paired regions
+        elif line.startswith("Paired Regions"):
+            current_record['paired_regions'] = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith("Unpaired Regions"):
+                region = lines[i].strip()
+                if region and not region.startswith("Paired Regions"):
+                    current_record['paired_regions'].append(region)
+                i += 1
+            continue
+
+        # Parse unpaired regions
+        elif line.startswith("Unpaired Regions"):
+            current_record['unpaired_regions'] = []
+            i += 1
+            while i < len(lines) and not (
+                lines[i].strip().startswith("Degradome") or
+                lines[i].strip().startswith("Degardome")
+            ):
+                region = lines[i].strip()
+                if region and not region.startswith("Unpaired Regions"):
+                    current_record['unpaired_regions'].append(region)
+                i += 1
+            continue
+
+        # Parse degradome data
+        elif line.startswith("Degradome data file:") or line.startswith("Degardome data file:"):
+            current_record['degradome_file'] = line.split(":")[1].strip()
+        elif line.startswith("Degradome Category:") or line.startswith("Degardome Category:"):
+            try:
+                current_record['degradome_category'] = int(line.split(":")[1].strip())
+            except ValueError:
+                # In case category isn't an integer
+                current_record['degradome_category'] = line.split(":")[1].strip()
+        elif line.startswith("Degradome p-value:") or line.startswith("Degardome p-value:"):
+            current_record['degradome_pvalue'] = float(line.split(":")[1].strip())
+        elif line.startswith("T-Plot file:"):
+            current_record['tplot_file'] = line.split(":")[1].strip()
+
+        # The query (miRNA) name ends the alignment line: 3' ... 5' Query: <miRNA>
+        elif "Query:" in line:
+            current_record['query'] = line.split("Query:", 1)[1].strip().split()[0]
+
+        # Parse position data
+        elif re.match(r"^\d+\s+\d+\s+\d+", line):
+            if 'positions' not in current_record:
+                current_record['positions'] = []
+
+            parts = line.split()
+            if len(parts) >= 3:
+                pos_data = {
+                    'position': int(parts[0]),
+                    'reads': int(parts[1]),
+                    'category': int(parts[2])
+                }
+                current_record['positions'].append(pos_data)
+
+        i += 1
+
+    # Add the last record
+    if current_record:
+        records.append(current_record)
+
+    return records
+
+def filter_records(records, min_mfe_ratio=None, max_allen_score=None, category=None, max_pvalue=None):
+    """Filter records based on the provided criteria."""
+    filtered = []
+
+    for record in records:
+        # Check if all required fields exist for filtering
+        pass_filter = True
+
+        # Apply MFE ratio filter if specified
+        if min_mfe_ratio is not None:
+            if 'mfe_ratio' not in record or record['mfe_ratio'] < min_mfe_ratio:
+                pass_filter = False
+
+        # Apply Allen score filter if specified
+        if max_allen_score is not None and pass_filter:
+            if 'allen_score' not in record or record['allen_score'] > max_allen_score:
+                pass_filter = False
+
+        # Apply category filter if specified
+        if category is not None and pass_filter:
+            if 'degradome_category' not in record or record['degradome_category'] not in category:
+                pass_filter = False
+
+        # Apply p-value filter if specified
+        if max_pvalue is not None and pass_filter:
+            if 'degradome_pvalue' not in record or record['degradome_pvalue'] > max_pvalue:
+                pass_filter = False
+
+        if pass_filter:
+            filtered.append(record)
+
+    return filtered
+
+def write_output(records, output_file):
+    """Write the filtered records to the output file."""
+    with open(output_file, 'w') as f:
+        for record in records:
+            f.write(f"SiteID: {record.get('site_id', 'Unknown')}\n")
+            f.write(f"MFE of perfect match: {record.get('mfe_perfect', 'N/A')}\n")
+            f.write(f"MFE of this site: {record.get('mfe_site', 'N/A')}\n")
+            f.write(f"MFEratio: {record.get('mfe_ratio', 'N/A')}\n")
+            f.write(f"Allen et al. score: {record.get('allen_score', 'N/A')}\n")
+
+            # Write paired regions
+            f.write("Paired Regions\n")
+            for region in record.get('paired_regions', []):
+                f.write(f"    {region}\n")
+
+            # Write unpaired regions
+            f.write("Unpaired Regions\n")
+            for region in record.get('unpaired_regions', []):
+                f.write(f"    {region}\n")
+
+            # Write degradome data
+            f.write(f"Degradome data file: {record.get('degradome_file', 'N/A')}\n")
+            f.write(f"Degradome Category: {record.get('degradome_category', 'N/A')}\n")
+            f.write(f"Degradome p-value: {record.get('degradome_pvalue', 'N/A')}\n")
+            if 'tplot_file' in record:
+                f.write(f"T-Plot file: {record.get('tplot_file', 'N/A')}\n")
+            elif 'query' in record:
+                # CleaveLand4 ran without -o: name the T-plot --render-tplots draws, so
+                # mirna-target-modules can still read the miRNA and target from it
+                f.write(f"T-Plot file: {tplot_name(record)}\n")
+
+            # Write position data
+            if 'positions' in record and record['positions']:
+                f.write("\nPosition\tReads\tCategory\n")
+                for pos in record['positions']:
+                    f.write(f"{pos['position']}\t{pos['reads']}\t{pos['category']}\n")
+
+            f.write("\n" + "-"*50 + "\n\n")
+
+def filter_cleaveland_output(input_file, output_file, min_mfe_ratio=None, max_allen_score=None,
+                             category=None, max_pvalue=None, return_records=False):
+    """
+    Filter CleaveLand output based on specified criteria.
+
+    This function integrates functionality from filter_cleaveland.py
+
+    Returns the number of records kept, or the kept records themselves
+    when return_records is True.
+    """
+    # Check if input file exists
+    if not os.path.isfile(input_file):
+        raise FileNotFoundError(f"Input file '{input_file}' does not exist")
+
+    # Parse the input file
+    with profiling.stage('parse') as stage:
+        records = parse_cleaveland_output(input_file)
+        stage.add(records=len(records), bytes=os.path.getsize(input_file))
+    print(f"Parsed {len(records)} records from the input file")
+
+    # Filter the records
+    with profiling.stage('filter') as stage:
+        filtered_records = filter_records(records, min_mfe_ratio=min_mfe_ratio, max_allen_score=max_allen_score,
+                                          category=category, max_pvalue=max_pvalue)
+        stage.add(records=len(records))
+    print(f"Filtered to {len(filtered_records)} records")
+
+    # Write the filtered records to the output file
+    with profiling.stage('write') as stage:
+        write_output(filtered_records, output_file)
+        stage.add(records=len(filtered_records), bytes=os.path.getsize(output_file))
+    print(f"Filtered results written to '{output_file}'")
+
+    if return_records:
+        return filtered_records
+    return len(filtered_records)
+
+def extract_ids_from_cleaveland(file_path):
+    """
+    Extract all SiteID values from CleaveLand output file.
+    Remove any characters from ':' and afterward.
+
+    This function integrates functionality from extract_ids.py
+    """
+    ids = []
+
+    with open(file_path, 'r') as file:
+        content = file.read()
+
+        # Split the content by potential record separators to process each record
+        records = re.split(r'\n\n+', content)
+
+        for record in records:
+            # Look for SiteID pattern
+            match = re.search(r'SiteID:\s*(\S+)', record)
+            if match:
+                full_id = match.group(1)
+                # Remove characters from ':' and afterward
+                clean_id = full_id.split(':')[0]
+                ids.append(clean_id)
+
+    return ids
+
+def filter_and_copy_pdfs(ids, pdf_dir, output_dir):
+    """
+    Filter PDF files based on IDs and copy to output directory.
+
+    This function integrates functionality from filter_copy_pdfs.py
+
+    Args:
+        ids: List of extracted IDs to match
+        pdf_dir: Directory containing PDF files
+        output_dir: Directory to copy matching PDFs to
+
+    Returns:
+        List of copied files
+    """
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+
+    copied_files = []
+
+    # Get all PDF files in the directory
+    pdf_files = [f for f in os.listdir(pdf_dir) if f.endswith('.pdf')]
+    print(f"Found {len(pdf_files)} PDF files in {pdf_dir}")
+
+    for pdf_file in pdf_files:
+        # Extract the Sevir ID from the PDF filename
+        # Pattern looks for: Sevir.XXXXXXXX.X in the filename
+        match = re.search(r'Sevir\.[\w\d]+\.\d+', pdf_file)
+        if match:
+            pdf_id = match.group(0)
+
+            # Check if this ID is in our list of extracted IDs
+            if pdf_id in ids:
+                src_path = os.path.join(pdf_dir, pdf_file)
+                dst_path = os.path.join(output_dir, pdf_file)
+
+                shutil.copy2(src_path, dst_path)
+                copied_files.append(pdf_file)
+                print(f"Copied: {pdf_file}")
+
+    return copied_files
+
+def tplot_name(record):
+    """
+    Return the T-plot file name (without extension) for a record.
+
+    Uses CleaveLand's own name when the record has a T-Plot file line,
+    otherwise builds the same <miRNA>_<target>_<pos>_TPlot name from the
+    query of the alignment and the SiteID. Only a .pdf/.png suffix is
+    stripped: the names written by write_output have none, and target IDs
+    such as Sevir.1G015900.1 contain dots.
+    """
+    if record.get('tplot_file'):
+        name = os.path.basename(record['tplot_file'])
+        stem, extension = os.path.splitext(name)
+        return stem if extension.lower() in TPLOT_EXTENSIONS else name
+    target, _, position = record.get('site_id', 'Unknown').rpartition(':')
+    if not target:
+        target, position = record.get('site_id', 'Unknown'), 'NA'
+    return f"{record.get('query', 'unknown')}_{target}_{position}_TPlot"
+
+def render_tplot(job):
+    """
+    Draw a single T-plot and return the path written.
+
+    job is a (name, positions, site_position, category, pvalue, output_path)
+    tuple so only plain data is sent to worker processes.
+    """
+    # Imported here so filtering without --render-tplots never pays for matplotlib
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    name, positions, site_position, category, pvalue, output_path = job
+
+    fig, ax = plt.subplots(figsize=(6, 4))
+    for position, reads, pos_category in positions:
+        color = TPLOT_CATEGORY_COLORS[pos_category] if 0 <= pos_category < len(TPLOT_CATEGORY_COLORS) else 'black'
+        ax.vlines(position, 0, reads, colors=color, linewidth=1)
+    if site_position is not None:
+        ax.axvline(site_position, color='red', linestyle='--', linewidth=0.8)
+
+    ax.set_xlabel('Transcript position (nt)')
+    ax.set_ylabel('Degradome reads')
+    ax.set_ylim(bottom=0)
+    ax.set_title(f"{name}\nCategory: {category}  p-value: {pvalue}", fontsize=9)
+    fig.tight_layout()
+    fig.savefig(output_path)
+    plt.close(fig)
+
+    return output_path
+
+def render_tplots(records, output_dir, image_format='pdf', workers=None):
+    """
+    Render T-plots for the given records in a process pool.
+
+    Args:
+        records: Filtered CleaveLand records (from filter_cleaveland_output)
+        output_dir: Directory to write the T-plots to
+        image_format: 'pdf' or 'png'
+        workers: Number of worker processes (default: all CPUs)
+
+    Returns:
+        List of rendered file names
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = []
+    for record in records:
+        if not record.get('positions'):
+            continue
+        name = tplot_name(record)
+        site = record.get('site_id', '').rsplit(':', 1)
+        site_position = int(site[1]) if len(site) == 2 and site[1].isdigit() else None
+        positions = [(p['position'], p['reads'], p['category']) for p in record['positions']]
+        output_path = os.path.join(output_dir, f"{name}.{image_format}")
+        jobs.append((name, positions, site_position, record.get('degradome_category', 'N/A'),
+                     record.get('degradome_pvalue', 'N/A'), output_path))
+
+    skipped = len(records) - len(jobs)
+    if skipped:
+        print(f"Skipping {skipped} records without position data")
+    if not jobs:
+        return []
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"Rendering {len(jobs)} T-plots to {output_dir}")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rendered = list(executor.map(render_tplot, jobs, chunksize=max(1, len(jobs) // 64)))
+
+    return [os.path.basename(path) for path in rendered]
+
+def output_bytes(output_dir, file_names):
+    """Total size of the written T-plots; only computed when profiling."""
+    if not profiling.enabled():
+        return 0
+    return sum(os.path.getsize(os.path.join(output_dir, name)) for name in file_names)
+
+def add_arguments(parser):
+    # Filter CleaveLand arguments
+    parser.add_argument('input_file', help='Path to the CleaveLand full_results.txt file')
+    parser.add_argument('--min-mfe-ratio', type=float, help='Minimum MFE ratio to keep')
+    parser.add_argument('--max-allen-score', type=float, help='Maximum Allen et al. score to keep')
+    parser.add_argument('--category', type=int, nargs='+', help='Degradome categories to keep (e.g., 0 1 2)')
+    parser.add_argument('--max-pvalue', type=float, help='Maximum p-value to keep')
+
+    # PDF filtering arguments
+    parser.add_argument('--pdf_dir', help='Directory containing PDF files (required unless --render-tplots is used)')
+    parser.add_argument('--output_dir', default='matched_pdfs', help='Directory to copy matching PDFs to (default: matched_pdfs)')
+
+    # T-plot rendering arguments
+    parser.add_argument('--render-tplots', action='store_true', help='Render T-plots for filtered records instead of copying PDFs')
+    parser.add_argument('--tplot-format', choices=['pdf', 'png'], default='pdf', help='Format of rendered T-plots (default: pdf)')
+    parser.add_argument('--workers', type=int, help='Number of processes used to render T-plots (default: all CPUs)')
+
+def run(args):
+    if not args.render_tplots and not args.pdf_dir:
+        sys.stderr.write("Error: --pdf_dir is required unless --render-tplots is used\n")
+        sys.exit(2)
+
+    try:
+        # Step 1: Filter CleaveLand results
+        filtered_output_file = "filtered_results.txt"
+        filtered_records = filter_cleaveland_output(
+            args.input_file,
+            filtered_output_file,
+            min_mfe_ratio=args.min_mfe_ratio,
+            max_allen_score=args.max_allen_score,
+            category=args.category,
+            max_pvalue=args.max_pvalue,
+            return_records=True
+        )
+        records_count = len(filtered_records)
+
+        # Step 2: Extract IDs from filtered results
+        print("\nExtracting IDs from filtered results...")
+        with profiling.stage('extract_ids') as stage:
+            extracted_ids = extract_ids_from_cleaveland(filtered_output_file)
+
+            # Save extracted IDs
+            ids_file = "extracted_ids.txt"
+            with open(ids_file, "w") as outfile:
+                for id_value in extracted_ids:
+                    outfile.write(f"{id_value}\n")
+            stage.add(records=len(extracted_ids), bytes=os.path.getsize(filtered_output_file))
+        print(f"Extracted {len(extracted_ids)} IDs saved to {ids_file}")
+
+        # Step 3: Render T-plots for the kept records, or copy CleaveLand's matching PDFs
+        if args.render_tplots:
+            print("\nRendering T-plots for filtered records...")
+            with profiling.stage('render_tplots') as stage:
+                copied_files = render_tplots(filtered_records, args.output_dir,
+                                             image_format=args.tplot_format, workers=args.workers)
+                stage.add(records=len(copied_files), bytes=output_bytes(args.output_dir, copied_files))
+        else:
+            print("\nCopying matching PDF files...")
+            with profiling.stage('copy_pdfs') as stage:
+                copied_files = filter_and_copy_pdfs(extracted_ids, args.pdf_dir, args.output_dir)
+                stage.add(records=len(copied_files), bytes=output_bytes(args.output_dir, copied_files))
+
+        # Save list of copied files
+        with open("copied_files.txt", "w") as outfile:
+            for file in copied_files:
+                outfile.write(f"{file}\n")
+
+        # Print summary
+        print(f"\nWorkflow complete!")
+        print(f"- Filtered {records_count} CleaveLand records")
+        print(f"- Extracted {len(extracted_ids)} unique IDs")
+        if args.render_tplots:
+            print(f"- Rendered {len(copied_files)} T-plots to {args.output_dir}/")
+        else:
+            print(f"- Copied {len(copied_files)} matching PDF files to {args.output_dir}/")
+        print(f"- Summary saved to copied_files.txt")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('filter-cleaveland', argv)
+
+if __name__ == "__main__":
+    main()
+                 
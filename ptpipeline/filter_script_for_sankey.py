@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+#USAGE: ptp sankey-table <mirna_file.tsv> <annotation_file.tsv> <output_file.tsv>
+#   or: python filter_script_for_sankey.py <mirna_file.tsv> <annotation_file.tsv> <output_file.tsv>
+
+import os
+import csv
+
+from . import profiling
+
+DESCRIPTION = 'Join miRNA targets with gene functions for the Sankey diagram table'
+
+PROFILE_OUTPUT_ARG = 'output_file'
+
+def process_files(mirna_file, annotation_file, output_file):
+    # Read miRNA data
+    mirna_data = []
+
+    with profiling.stage('read_mirna') as stage, open(mirna_file, 'r') as f:
+        reader = csv.reader(f, delimiter='\t')
+
+        # Read header and print it to debug
+        header = next(reader)
+        print("miRNA file headers:", header)
+
+        # Find the indices of the columns we need
+        # Use case-insensitive matching and handle potential whitespace
+        mirna_id_index = None
+        gene_index = None
+        # Optional column added by mirna-target-modules.py when run with a GFF3 file
+        feature_index = None
+
+        for i, col in enumerate(header):
+            if col.strip().lower() == "mirna id":
+                mirna_id_index = i
+            elif col.strip().lower() == "gene":
+                gene_index = i
+            elif col.strip().lower() == "cleavage feature":
+                feature_index = i
+
+        if mirna_id_index is None or gene_index is None:
+            print("Error: Could not find 'miRNA ID' or 'Gene' columns in miRNA file")
+            print("Available columns:", header)
+            return
+
+        print(f"Found miRNA ID at index {mirna_id_index} and Gene at index {gene_index}")
+
+        # Read data rows
+        for row in reader:
+            print(f"Processing miRNA row: {row}")
+            if len(row) > max(mirna_id_index, gene_index):
+                mirna_id = row[mirna_id_index].strip()
+                gene = row[gene_index].strip()
+                # Extract the gene part (without version number) if present
+                gene_base = gene.split('.')[0] if '.' in gene else gene
+                feature = row[feature_index].strip() if feature_index is not None and len(row) > feature_index else None
+                mirna_data.append((mirna_id, gene, gene_base, feature))
+        stage.add(records=len(mirna_data), bytes=os.path.getsize(mirna_file))
+
+    print(f"Loaded {len(mirna_data)} miRNA entries")
+
+    # Read annotation data
+    annotation_data = {}
+
+    with profiling.stage('read_annotation') as stage, open(annotation_file, 'r') as f:
+        reader = csv.reader(f, delimiter='\t')
+
+        # Read header and print it to debug
+        header = next(reader)
+        print("Annotation file headers:", header)
+
+        # Find the indices of the columns we need
+        # Use case-insensitive matching and handle potential whitespace
+        setaria_id_index = None
+        function_index = None
+
+        for i, col in enumerate(header):
+            if col.strip().lower() == "setaria viridis id":
+                setaria_id_index = i
+            elif col.strip().lower() == "function":
+                function_index = i
+
+        if setaria_id_index is None or function_index is None:
+            print("Error: Could not find 'Setaria viridis ID' or 'Function' columns in annotation file")
+            print("Available columns:", header)
+            return
+
+        print(f"Found Setaria ID at index {setaria_id_index} and Function at index {function_index}")
+
+        # Read data rows
+        for row in reader:
+            print(f"Processing annotation row: {row}")
+            if len(row) > max(setaria_id_index, function_index):
+                setaria_id = row[setaria_id_index].strip()
+                function = row[function_index].strip()
+
+                # Store function for each gene ID
+                annotation_data[setaria_id] = function
+        stage.add(records=len(annotation_data), bytes=os.path.getsize(annotation_file))
+
+    print(f"Loaded {len(annotation_data)} annotation entries")
+    print(f"Annotation data: {annotation_data}")
+
+    # Generate output
+    output_rows = []
+    with profiling.stage('write') as stage, open(output_file, 'w') as f:
+        writer = csv.writer(f, delimiter='\t')
+        if feature_index is not None:
+            writer.writerow(["miRNA ID", "Gene", "Function", "Cleavage Feature"])
+        else:
+            writer.writerow(["miRNA ID", "Gene", "Function"])
+
+        for mirna_id, original_gene, gene_base, feature in mirna_data:
+            print(f"Looking up gene: {gene_base}")
+            # Try exact match first
+            function = annotation_data.get(gene_base, "")
+
+            # If no match, try without version number
+            if not function and '.' in original_gene:
+                base_gene = original_gene.split('.')[0]
+                function = annotation_data.get(base_gene, "")
+                print(f"Trying base gene: {base_gene}, found function: {function}")
+
+            if function:  # Only output if function is found
+                print(f"Match found: {mirna_id}, {gene_base}, {function}")
+                row = [mirna_id, gene_base, function]
+                if feature_index is not None:
+                    row.append(feature or "")
+                writer.writerow(row)
+                output_rows.append(row)
+        stage.add(records=len(mirna_data))
+
+    print(f"Generated {len(output_rows)} output rows")
+    return output_rows
+
+def add_arguments(parser):
+    parser.add_argument('mirna_file', help="miRNA table with 'miRNA ID' and 'Gene' columns")
+    parser.add_argument('annotation_file', help="Annotation table with 'Setaria viridis ID' and 'Function' columns")
+    parser.add_argument('output_file', help='Output TSV file')
+
+def run(args):
+    print(f"Processing files: {args.mirna_file}, {args.annotation_file}, {args.output_file}")
+    results = process_files(args.mirna_file, args.annotation_file, args.output_file)
+
+    if not results or len(results) == 0:
+        print("Warning: No matching entries found!")
+        print("Please check that:")
+        print("1. The column names exactly match 'miRNA ID', 'Gene', 'Setaria viridis ID', and 'Function'")
+        print("2. The gene IDs in the miRNA file match the Setaria viridis IDs in the annotation file")
+        print("3. There are no extra spaces or special characters in the data")
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('sankey-table', argv)
+
+if __name__ == "__main__":
+    main()
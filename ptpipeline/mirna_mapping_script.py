@@ -0,0 +1,133 @@
+# This script adds miRNA information to a table based on a fasta file
+#USAGE: ptp mirna-mapping miRNA.fasta miRNA_table.txt > miRNA_output.txt
+#   or: python miRNA_mapping_script.py miRNA.fasta miRNA_table.txt > miRNA_output.txt
+import os
+import sys
+
+from . import profiling
+
+DESCRIPTION = 'Add miRNA names and types from a FASTA file to a miRNA/target table'
+
+def parse_fasta(fasta_file):
+    """Parse a fasta file and return a dictionary mapping chromosome IDs to full miRNA names and miRNA types"""
+    mapping = {}
+    current_name = None
+
+    with open(fasta_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('>'):
+                # Process header line
+                full_name = line[1:]  # Remove '>' character
+
+                # Extract the chromosome ID (part after first '_')
+                parts = full_name.split('_', 1)
+                if len(parts) > 1:
+                    miRNA_type = parts[0]  # e.g., miR166 or novel1
+                    chr_id = parts[1]      # e.g., Chr09_45260
+
+                    # Store the mapping
+                    mapping[chr_id] = {
+                        'full_name': full_name,
+                        'miRNA_type': miRNA_type
+                    }
+
+    return mapping
+
+def read_extra_columns(infile):
+    """Read the header line and return the names of the columns after miRNA ID and Target ID"""
+    header = infile.readline().rstrip('\r\n')
+    return header.split('\t')[2:] if '\t' in header else []
+
+def extra_values(parts, extra_columns):
+    """Values of the extra columns for one row, padded if the row is short"""
+    values = parts[2:2 + len(extra_columns)]
+    return values + [''] * (len(extra_columns) - len(values))
+
+def process_table(table_file, output_file, miRNA_mapping):
+    """Process the table file and add the new columns"""
+    with open(table_file, 'r') as infile, open(output_file, 'w') as outfile:
+        # Keep any columns after miRNA ID and Target ID (e.g. Cleavage Feature)
+        extra_columns = read_extra_columns(infile)
+
+        # Write header
+        outfile.write("\t".join(["Original miRNA ID", "miRNA_Chr ID", "miRNA ID", "Target ID"] + extra_columns) + "\n")
+
+        # Process data lines
+        for line in infile:
+            parts = line.strip().split()
+            if len(parts) >= 2:
+                chr_id = parts[0]  # e.g., Chr09_45260
+                target_id = parts[1]  # e.g., Sevir.1G015900.1
+
+                # Look up the miRNA information
+                if chr_id in miRNA_mapping:
+                    full_name = miRNA_mapping[chr_id]['full_name']
+                    miRNA_type = miRNA_mapping[chr_id]['miRNA_type']
+                else:
+                    # If no mapping found, use placeholders
+                    full_name = "Unknown"
+                    miRNA_type = "Unknown"
+
+                # Write the new line
+                outfile.write("\t".join([chr_id, full_name, miRNA_type, target_id] + extra_values(parts, extra_columns)) + "\n")
+
+def add_arguments(parser):
+    parser.add_argument('fasta_file', help='miRNA FASTA file (headers like miR166_Chr09_45260)')
+    parser.add_argument('table_file', help='miRNA/target table (e.g. from mirna-target-modules.py)')
+
+def run(args):
+    # Parse the fasta file
+    with profiling.stage('parse_fasta') as stage:
+        miRNA_mapping = parse_fasta(args.fasta_file)
+        stage.add(records=len(miRNA_mapping), bytes=os.path.getsize(args.fasta_file))
+
+    # Process the table and output to stdout
+    with profiling.stage('map_targets') as stage:
+        count = process_table_to_stdout(args.table_file, miRNA_mapping)
+        stage.add(records=count, bytes=os.path.getsize(args.table_file))
+
+# Main execution
+def main(argv=None):
+    from .cli import run_command
+    run_command('mirna-mapping', argv)
+
+def process_table_to_stdout(table_file, miRNA_mapping):
+    """Process the table file and output to stdout; returns the number of rows written"""
+    count = 0
+
+    with open(table_file, 'r') as infile:
+        # Keep any columns after miRNA ID and Target ID (e.g. Cleavage Feature)
+        extra_columns = read_extra_columns(infile)
+
+        # Write header
+        sys.stdout.write("\t".join(["Original miRNA ID", "miRNA_Chr ID", "miRNA ID", "Target ID", "Gene"] + extra_columns) + "\n")
+
+        # Process data lines
+        for line in infile:
+            parts = line.strip().split()
+            if len(parts) >= 2:
+                chr_id = parts[0]  # e.g., Chr09_45260
+                target_id = parts[1]  # e.g., Sevir.1G015900.1
+
+                # Extract gene name (everything before the last dot)
+                gene_parts = target_id.rsplit('.', 1)
+                gene = gene_parts[0] if len(gene_parts) > 1 else target_id
+
+                # Look up the miRNA information
+                if chr_id in miRNA_mapping:
+                    full_name = miRNA_mapping[chr_id]['full_name']
+                    miRNA_type = miRNA_mapping[chr_id]['miRNA_type']
+                else:
+                    # If no mapping found, use placeholders
+                    full_name = "Unknown"
+                    miRNA_type = "Unknown"
+
+                # Write the new line to stdout
+                sys.stdout.write("\t".join([chr_id, full_name, miRNA_type, target_id, gene] + extra_values(parts, extra_columns)) + "\n")
+                count += 1
+
+    return count
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
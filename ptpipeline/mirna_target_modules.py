@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+#USAGE: ptp target-modules filtered_results.txt [annotation.gff3] [--cache_dir DIR] > mirna-target-modules-table.txt
+#   or: python mirna-target-modules.py filtered_results.txt [annotation.gff3] [--cache_dir DIR] > mirna-target-modules-table.txt
+# With a GFF3 file, a "Cleavage Feature" column (5'UTR, CDS or 3'UTR) is added for each site;
+# the parsed GFF3 is cached in --cache_dir (default: gff_index_cache)
+
+import os
+import sys
+
+from . import profiling
+
+DESCRIPTION = 'Extract miRNA/target modules from filtered CleaveLand results'
+
+def extract_and_print_ids(file_path, gff_file=None, cache_dir='gff_index_cache'):
+    """
+    Extract miRNA ID and Target ID from filtered_results.txt file
+    based on the T-Plot file lines and print results.
+
+    If gff_file is given, also print the transcript feature each
+    cleavage site falls in (see cleavage_site_features.py).
+    """
+    feature_index = None
+    if gff_file:
+        from .cleavage_site_features import load_feature_index
+        with profiling.stage('load_features'):
+            feature_index = load_feature_index(gff_file, cache_dir)
+
+    # Print the header first
+    if feature_index:
+        print("miRNA ID\tTarget ID\tCleavage Feature")
+    else:
+        print("miRNA ID\tTarget ID")
+    found_count = 0
+
+    try:
+        with profiling.stage('extract') as stage, open(file_path, 'r') as file:
+            for line in file:
+                if "T-Plot file:" in line:
+                    # Extract the filename part from the path
+                    # Example: T-Plot file: cleaveland_results/Chr09_39038_Sevir.1G015900.1_1032_TPlot.pdf
+                    # (rendered T-plots are named without the directory part)
+                    filename = line.split("T-Plot file:", 1)[1].strip().split('/')[-1]
+
+                    # Split by underscore to get components
+                    parts = filename.split('_')
+
+                    if len(parts) >= 4:
+                        # Extract miRNA ID (first two parts) and Target ID (third part)
+                        mirna_id = f"{parts[0]}_{parts[1]}"
+                        target_id = parts[2]
+
+                        # Print as tab-separated values
+                        if feature_index:
+                            position = int(parts[3]) if parts[3].isdigit() else None
+                            feature = feature_index.lookup(target_id, position) if position is not None else 'none'
+                            print(f"{mirna_id}\t{target_id}\t{feature}")
+                        else:
+                            print(f"{mirna_id}\t{target_id}")
+                        found_count += 1
+            stage.add(records=found_count, bytes=os.path.getsize(file_path))
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        failed = True
+    else:
+        failed = False
+
+    # Print summary to stderr
+    print(f"Processed file: {file_path}", file=sys.stderr)
+    print(f"Found {found_count} entries", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+def add_arguments(parser):
+    parser.add_argument('filtered_results', help='filtered_results.txt from filter-cleaveland-results.py')
+    parser.add_argument('gff3', nargs='?', help="Optional GFF3 file to add the 5'UTR/CDS/3'UTR of each site")
+    parser.add_argument('--cache_dir', default='gff_index_cache', help='Directory for the cached GFF3 feature index (default: gff_index_cache)')
+
+def run(args):
+    extract_and_print_ids(args.filtered_results, args.gff3, args.cache_dir)
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('target-modules', argv)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
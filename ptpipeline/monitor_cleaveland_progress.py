@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+##USAGE: ptp monitor-progress --log <log_file> --total_srna <n> --total_transcripts <n> [options]
+#    or: python monitor_cleaveland_progress.py --log <log_file> --total_srna <n> --total_transcripts <n> [options]
+#*Example: python monitor_cleaveland_progress.py --log cleaveland_run.log --total_srna 1200 --total_transcripts 52000 --stop_file cleaveland_progress.tmp --json cleaveland_results/progress.json
+
+# Progress monitor used by cleaveland_wrapper.sh. Instead of re-reading the whole
+# log on every update, it remembers the byte offset it stopped at and only reads
+# what CleaveLand4 appended since, so the cost of each update stays constant as
+# the log grows.
+
+# Required Arguments:
+
+# --log: Log file CleaveLand4 output is appended to
+# --total_srna: Total number of small RNAs (precounted by the wrapper)
+# --total_transcripts: Total number of transcripts (precounted by the wrapper)
+
+# Optional Arguments:
+
+# --stop_file: Keep monitoring while this file exists (default: monitor until interrupted)
+# --json: Write machine-readable progress to this file on every update
+# --start_time: Epoch seconds the run started at (default: now)
+# --interval: Seconds between updates (default: 2)
+
+import os
+import sys
+import json
+import time
+
+from . import profiling
+
+DESCRIPTION = 'Monitor CleaveLand4 progress by tailing its log'
+
+PROFILE_OUTPUT_ARG = 'json'
+
+SRNA_MARKER = b"Processing sRNA"
+TRANSCRIPT_MARKER = b"Processing transcript"
+
+class LogTail:
+    """Incrementally count progress markers in a growing log file."""
+
+    def __init__(self, log_file):
+        self.log_file = log_file
+        self.offset = 0
+        self.remainder = b''
+        self.srna_count = 0
+        self.transcript_count = 0
+
+    def update(self):
+        """Read bytes appended since the last call and update the counters."""
+        try:
+            size = os.path.getsize(self.log_file)
+        except OSError:
+            return
+
+        # The log was truncated or replaced; start over
+        if size < self.offset:
+            self.offset = 0
+            self.remainder = b''
+            self.srna_count = 0
+            self.transcript_count = 0
+
+        if size == self.offset:
+            return
+
+        with open(self.log_file, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        # Only count complete lines; keep the trailing partial line for next time
+        data = self.remainder + data
+        cut = data.rfind(b'\n') + 1
+        complete, self.remainder = data[:cut], data[cut:]
+
+        self.srna_count += complete.count(SRNA_MARKER)
+        self.transcript_count += complete.count(TRANSCRIPT_MARKER)
+
+def format_duration(seconds):
+    """Format seconds as HH:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+def progress_snapshot(tail, total_srna, total_transcripts, start_time, now):
+    """
+    Summarize the current progress as a dict.
+
+    The phase follows the wrapper's original monitor: small RNA progress when
+    CleaveLand4 reports it, otherwise transcript progress.
+    """
+    elapsed = max(now - start_time, 0.0)
+
+    if tail.srna_count:
+        phase, done, total = 'small_rna', tail.srna_count, total_srna
+    elif tail.transcript_count:
+        phase, done, total = 'transcripts', tail.transcript_count, total_transcripts
+    else:
+        phase, done, total = 'starting', 0, total_srna
+
+    rate = done / elapsed if elapsed > 0 else 0.0
+    percent = done * 100.0 / total if total else 0.0
+    eta = (total - done) / rate if rate > 0 and total >= done else None
+
+    return {
+        'phase': phase,
+        'small_rna_processed': tail.srna_count,
+        'small_rna_total': total_srna,
+        'transcripts_processed': tail.transcript_count,
+        'transcripts_total': total_transcripts,
+        'percent': round(percent, 2),
+        'rate_per_second': round(rate, 4),
+        'elapsed_seconds': round(elapsed, 1),
+        'eta_seconds': round(eta, 1) if eta is not None else None,
+        'log_bytes_read': tail.offset,
+        'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now)),
+    }
+
+def write_json(snapshot, json_file):
+    """Atomically replace the progress JSON so readers never see a partial file."""
+    tmp_file = json_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_file, json_file)
+
+def format_status(snapshot):
+    """Build the single-line console status shown by the wrapper."""
+    if snapshot['phase'] == 'small_rna':
+        status = (f"Processing small RNA: {snapshot['small_rna_processed']}/{snapshot['small_rna_total']} "
+                  f"({snapshot['percent']:.0f}%) ")
+        if snapshot['transcripts_processed']:
+            status += f"| Transcripts: {snapshot['transcripts_processed']}/{snapshot['transcripts_total']} "
+    elif snapshot['phase'] == 'transcripts':
+        status = (f"Processing transcripts: {snapshot['transcripts_processed']}/{snapshot['transcripts_total']} "
+                  f"({snapshot['percent']:.0f}%) ")
+    else:
+        status = "Waiting for CleaveLand4 progress... "
+
+    status += f"| Elapsed: {format_duration(snapshot['elapsed_seconds'])}"
+    if snapshot['eta_seconds'] is not None:
+        status += f" | ETA: {format_duration(snapshot['eta_seconds'])}"
+    return status
+
+def monitor(log_file, total_srna, total_transcripts, stop_file=None, json_file=None,
+            start_time=None, interval=2.0):
+    """Poll the log until the stop file disappears (or forever if none is given)."""
+    tail = LogTail(log_file)
+    start_time = start_time if start_time is not None else time.time()
+
+    with profiling.stage('monitor') as stage:
+        while True:
+            running = stop_file is None or os.path.exists(stop_file)
+
+            offset = tail.offset
+            tail.update()
+            # One record per poll; bytes are the log bytes read by it
+            stage.add(records=1, bytes=max(0, tail.offset - offset))
+            snapshot = progress_snapshot(tail, total_srna, total_transcripts, start_time, time.time())
+            snapshot['running'] = running
+            if json_file:
+                write_json(snapshot, json_file)
+            sys.stdout.write("\r" + format_status(snapshot))
+            sys.stdout.flush()
+
+            if not running:
+                break
+            time.sleep(interval)
+
+    sys.stdout.write("\n")
+    return snapshot
+
+def add_arguments(parser):
+    parser.add_argument('--log', required=True, help='Log file CleaveLand4 output is appended to')
+    parser.add_argument('--total_srna', type=int, required=True, help='Total number of small RNAs')
+    parser.add_argument('--total_transcripts', type=int, required=True, help='Total number of transcripts')
+    parser.add_argument('--stop_file', help='Keep monitoring while this file exists')
+    parser.add_argument('--json', help='Write machine-readable progress to this file')
+    parser.add_argument('--start_time', type=float, help='Epoch seconds the run started at (default: now)')
+    parser.add_argument('--interval', type=float, default=2.0, help='Seconds between updates (default: 2)')
+
+def run(args):
+    try:
+        monitor(args.log, args.total_srna, args.total_transcripts,
+                stop_file=args.stop_file, json_file=args.json,
+                start_time=args.start_time, interval=args.interval)
+    except KeyboardInterrupt:
+        sys.stdout.write("\n")
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('monitor-progress', argv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Per-stage instrumentation shared by every ptp command (--profile).
+
+Commands wrap their logical steps in ``stage()``:
+
+    with profiling.stage('parse') as st:
+        records = parse_cleaveland_output(input_file)
+        st.add(records=len(records), bytes=os.path.getsize(input_file))
+
+When profiling is off, ``stage()`` returns a shared no-op object, so the
+instrumentation costs nothing measurable in normal runs. When it is on, wall
+time, CPU time, records/bytes and peak memory are recorded for each stage and
+written as a JSON summary; --profile-dump also writes cProfile statistics.
+CPU time of child processes (T-plot workers, pipeline stage commands) is
+reported separately as children_cpu_seconds.
+"""
+
+import os
+import sys
+import time
+import resource
+
+# Profiler of the command currently running, if --profile was given
+_active = None
+
+class _NullStage:
+    """Stand-in used when profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add(self, records=0, bytes=0):
+        pass
+
+_NULL_STAGE = _NullStage()
+
+def stage(name):
+    """Context manager measuring one logical stage of the running command."""
+    if _active is None:
+        return _NULL_STAGE
+    return _Stage(_active, name)
+
+def enabled():
+    """True while a command runs with --profile; use it to skip costly counting otherwise."""
+    return _active is not None
+
+def add_profile_arguments(parser):
+    """Add the --profile options to a command's argument parser."""
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help='Write per-stage wall/CPU time, records, bytes and peak memory as JSON next to the outputs')
+    group.add_argument('--profile-output', help='Path of the profile summary (default: <output dir>/<command>_profile.json)')
+    group.add_argument('--profile-dump', help='Also write cProfile statistics to this file (implies --profile)')
+    group.add_argument('--profile-memory', action='store_true',
+                       help='Trace Python allocations per stage with tracemalloc; slower (implies --profile)')
+
+def profiling_requested(args):
+    return bool(args.profile or args.profile_output or args.profile_dump or args.profile_memory)
+
+def summary_path(args, command, output_arg=None):
+    """
+    Return where the summary JSON goes: --profile-output if given, otherwise
+    next to the command's main output (the argument named by output_arg),
+    falling back to the current directory.
+
+    cli.run_command passes the module's PROFILE_OUTPUT_ARG attribute as
+    output_arg: the dest of the argument holding the command's main output
+    file or directory. Modules without one write the summary to the
+    current directory.
+    """
+    if args.profile_output:
+        return args.profile_output
+
+    directory = '.'
+    output = getattr(args, output_arg, None) if output_arg else None
+    if output:
+        directory = output if os.path.isdir(output) else (os.path.dirname(output) or '.')
+    return os.path.join(directory, f"{command}_profile.json")
+
+def _ensure_parent(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+def _peak_rss_kb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _children_cpu():
+    # CPU time of child processes (T-plot workers, pipeline stages) once they have been waited for
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+class _Stage:
+    """Measurements for one stage; created by stage() while a Profiler is active."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.records = 0
+        self.bytes = 0
+
+    def add(self, records=0, bytes=0):
+        """Count records and bytes processed in this stage."""
+        self.records += records
+        self.bytes += bytes
+
+    def __enter__(self):
+        if self.profiler.trace_memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+        self.rss_start = _peak_rss_kb()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.children_cpu_start = _children_cpu()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        children_cpu = _children_cpu() - self.children_cpu_start
+        peak_rss = _peak_rss_kb()
+
+        entry = {
+            'stage': self.name,
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'records': self.records,
+            'bytes': self.bytes,
+            'records_per_second': round(self.records / wall, 1) if wall and self.records else None,
+            'mb_per_second': round(self.bytes / wall / 1e6, 3) if wall and self.bytes else None,
+            'peak_rss_kb': peak_rss,
+            'rss_growth_kb': peak_rss - self.rss_start,
+        }
+        if children_cpu:
+            entry['children_cpu_seconds'] = round(children_cpu, 6)
+        if self.profiler.trace_memory:
+            import tracemalloc
+            entry['python_peak_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        if exc_type is not None:
+            entry['error'] = exc_type.__name__
+
+        self.profiler.stages.append(entry)
+        return False
+
+class Profiler:
+    """Collects stage measurements for one command run and writes the summary."""
+
+    def __init__(self, command, summary_file, dump_file=None, trace_memory=False, argv=None):
+        self.command = command
+        self.summary_file = summary_file
+        self.dump_file = dump_file
+        self.trace_memory = trace_memory
+        self.argv = list(sys.argv[1:] if argv is None else argv)
+        self.stages = []
+        self._cprofile = None
+
+    def __enter__(self):
+        global _active
+        _active = self
+
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.dump_file:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+
+        self.started_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.children_cpu_start = _children_cpu()
+        if self._cprofile:
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import json
+        global _active
+        if self._cprofile:
+            self._cprofile.disable()
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        _active = None
+
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.stop()
+        if self._cprofile:
+            _ensure_parent(self.dump_file)
+            self._cprofile.dump_stats(self.dump_file)
+
+        # SystemExit(0) is a normal end of run for these scripts
+        failed = exc_type is not None and not (exc_type is SystemExit and exc.code in (None, 0))
+        summary = {
+            'command': self.command,
+            'argv': self.argv,
+            'started_at': self.started_at,
+            'status': 'failed' if failed else 'ok',
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            'peak_rss_kb': _peak_rss_kb(),
+            'children_cpu_seconds': round(_children_cpu() - self.children_cpu_start, 6),
+            'children_peak_rss_kb': _peak_rss_kb(resource.RUSAGE_CHILDREN),
+            'stages': self.stages,
+            'cprofile_file': self.dump_file,
+        }
+
+        _ensure_parent(self.summary_file)
+        with open(self.summary_file, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+        self.print_summary(summary)
+        return False
+
+    def print_summary(self, summary):
+        """Print a short per-stage table to stderr (stdout may carry a command's table)."""
+        out = sys.stderr
+        out.write(f"\nProfile of '{self.command}' ({summary['wall_seconds']:.3f}s wall, "
+                  f"{summary['cpu_seconds']:.3f}s CPU, peak RSS {summary['peak_rss_kb'] / 1024:.1f} MB)\n")
+        if summary['children_cpu_seconds']:
+            out.write(f"Child processes: {summary['children_cpu_seconds']:.3f}s CPU, "
+                      f"largest peak RSS {summary['children_peak_rss_kb'] / 1024:.1f} MB\n")
+        for entry in self.stages:
+            out.write(f"  {entry['stage']:<20} {entry['wall_seconds']:9.3f}s  {entry['cpu_seconds']:9.3f}s CPU  "
+                      f"{entry['records']:>10} records  {entry['bytes']:>12} bytes\n")
+        out.write(f"Profile summary written to {self.summary_file}\n")
+        if self.dump_file:
+            out.write(f"cProfile statistics written to {self.dump_file}\n")
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+
+##USAGE: ptp run-pipeline <pipeline.toml|pipeline.yaml> [options]
+#    or: python run_pipeline.py <pipeline.toml|pipeline.yaml> [options]
+#*Example: ptp run-pipeline pipeline.example.toml --workers 4
+
+# Runs the pipeline stages declared in a TOML or YAML file as a DAG. Each stage is
+# keyed on the content of its inputs, its command, its parameters and the code it
+# runs (this package for "ptp" stages, the script file for "python script.py" or
+# "perl script.pl" stages); stages whose key matches the last successful run (and
+# whose outputs are unchanged) are skipped, and stages that do not depend on each
+# other run in parallel. Changing a parameter such as a p-value cutoff therefore
+# only re-runs that stage and the ones downstream of it whose inputs actually
+# changed. Declared outputs are deleted before a stage runs, so a failed run can
+# never leave the previous run's files behind as if they were its own. Use --force
+# after changing an external tool that is called by name (e.g. seqkit).
+
+# Required Arguments:
+
+# config: Pipeline definition (see pipeline.example.toml)
+
+# Optional Arguments:
+
+# --workers: Number of stages to run at the same time (default: settings.workers or 1)
+# --force: Re-run this stage even if it is cached; repeat for several (e.g., --force cleaveland --force sankey)
+# --dry-run: Only report which stages would run
+
+# Stage fields:
+
+# command: List of arguments; {inputs[N]}, {outputs[N]}, {params[name]} and {script_dir} are filled in,
+#          a leading "python" is replaced by the running interpreter and a leading "ptp" runs a
+#          subcommand of this package with it
+# inputs / outputs: Files or directories, relative to the config file
+# params: Values available to the command; they are part of the cache key
+# stdout: File to write the command's standard output to (for scripts that print their table)
+# workdir: Directory to run the command in, relative to the config file (default: config directory)
+# after: Extra stage names to wait for besides those inferred from inputs/outputs
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from . import profiling, __version__
+
+DESCRIPTION = 'Run the analysis pipeline with stage-level caching'
+
+PROFILE_OUTPUT_ARG = 'config'
+
+# Directory holding the standalone scripts (the repository root)
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(PACKAGE_DIR)
+
+class PipelineError(Exception):
+    """Raised for invalid pipeline definitions."""
+
+def load_config(config_file):
+    """Read a pipeline definition from a TOML or YAML file."""
+    if config_file.endswith(('.yaml', '.yml')):
+        # Only needed for YAML definitions
+        import yaml
+        with open(config_file, 'r') as f:
+            return yaml.safe_load(f) or {}
+
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        # Python < 3.11: the same parser is available as tomli
+        import tomli as tomllib
+    with open(config_file, 'rb') as f:
+        return tomllib.load(f)
+
+class HashCache:
+    """Content hashes of files, reused while a file's size and mtime are unchanged."""
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self.entries = {}
+        if os.path.isfile(cache_file):
+            with open(cache_file, 'r') as f:
+                self.entries = json.load(f)
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        entry = self.entries.get(path)
+        if entry and entry['signature'] == signature:
+            return entry['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self.entries[path] = {'signature': signature, 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def path_hash(self, path):
+        """Hash a file, or a directory as the hashes of all files below it."""
+        if os.path.isfile(path):
+            return self.file_hash(path)
+        if os.path.isdir(path):
+            digest = hashlib.sha256()
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    digest.update(os.path.relpath(file_path, path).encode())
+                    digest.update(self.file_hash(file_path).encode())
+            return digest.hexdigest()
+        return None
+
+    def save(self):
+        tmp_file = self.cache_file + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_file, self.cache_file)
+
+class Stage:
+    """One pipeline step and the files it reads and writes."""
+
+    def __init__(self, name, spec, base_dir):
+        if 'command' not in spec:
+            raise PipelineError(f"Stage '{name}' has no command")
+
+        self.name = name
+        self.base_dir = base_dir
+        self.inputs = [self.resolve(p) for p in spec.get('inputs', [])]
+        self.outputs = [self.resolve(p) for p in spec.get('outputs', [])]
+        self.params = spec.get('params', {})
+        self.stdout = self.resolve(spec['stdout']) if spec.get('stdout') else None
+        self.workdir = self.resolve(spec.get('workdir', '.'))
+        self.after = list(spec.get('after', []))
+        self.command = self.format_command(spec['command'])
+        self.dependencies = set()
+
+    def resolve(self, path):
+        return os.path.normpath(os.path.join(self.base_dir, path))
+
+    def format_command(self, command):
+        if isinstance(command, str):
+            raise PipelineError(f"Stage '{self.name}': command must be a list of arguments")
+        values = {'inputs': self.inputs, 'outputs': self.outputs,
+                  'params': self.params, 'script_dir': SCRIPT_DIR}
+        try:
+            formatted = [str(arg).format(**values) for arg in command]
+        except (KeyError, IndexError) as e:
+            raise PipelineError(f"Stage '{self.name}': unknown placeholder {e} in command")
+        if formatted and formatted[0] in ('python', 'python3'):
+            formatted[0] = sys.executable
+        elif formatted and formatted[0] == 'ptp':
+            formatted[:1] = [sys.executable, '-m', 'ptpipeline']
+        return formatted
+
+    def code_files(self):
+        """Files holding the code this stage runs, so editing them invalidates its cache."""
+        if self.command[:3] == [sys.executable, '-m', 'ptpipeline']:
+            # Subcommands share modules (profiling, cli, ...), so any change in the package counts
+            return sorted(os.path.join(PACKAGE_DIR, name) for name in os.listdir(PACKAGE_DIR) if name.endswith('.py'))
+        # A script run by an interpreter ("python script.py", "perl CleaveLand4.pl") or directly
+        files = []
+        for arg in self.command[:2]:
+            path = os.path.join(self.workdir, arg)
+            if arg != sys.executable and os.path.isfile(path):
+                files.append(os.path.normpath(path))
+        return files
+
+    def cache_key(self, hashes):
+        """Key over the command, parameters, code and content of every input."""
+        digest = hashlib.sha256()
+        description = {
+            'command': self.command,
+            'params': self.params,
+            'stdout': self.stdout,
+            'workdir': self.workdir,
+            'inputs': [(path, hashes.path_hash(path)) for path in self.inputs],
+            'version': __version__,
+            'code': [(path, hashes.file_hash(path)) for path in self.code_files()],
+        }
+        digest.update(json.dumps(description, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+def build_stages(config, base_dir):
+    """Create the stages and infer dependencies from matching inputs and outputs."""
+    specs = config.get('stages', {})
+    if not specs:
+        raise PipelineError("No stages defined")
+
+    stages = {name: Stage(name, spec, base_dir) for name, spec in specs.items()}
+
+    producers = {}
+    for stage in stages.values():
+        for output in stage.outputs + ([stage.stdout] if stage.stdout else []):
+            if output in producers:
+                raise PipelineError(f"'{output}' is produced by both '{producers[output]}' and '{stage.name}'")
+            producers[output] = stage.name
+
+    for stage in stages.values():
+        for path in stage.inputs:
+            if path in producers and producers[path] != stage.name:
+                stage.dependencies.add(producers[path])
+        for name in stage.after:
+            if name not in stages:
+                raise PipelineError(f"Stage '{stage.name}' waits for unknown stage '{name}'")
+            stage.dependencies.add(name)
+
+    # Reject cycles before anything runs
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise PipelineError(f"Dependency cycle involving stage '{name}'")
+        visiting.add(name)
+        for dependency in stages[name].dependencies:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in stages:
+        visit(name)
+
+    return stages
+
+def is_cached(stage, key, state_dir, hashes):
+    """True if the last successful run had the same key and its outputs are untouched."""
+    state_file = os.path.join(state_dir, f"{stage.name}.json")
+    if not os.path.isfile(state_file):
+        return False
+    with open(state_file, 'r') as f:
+        state = json.load(f)
+    if state.get('key') != key:
+        return False
+    for path, recorded_hash in state.get('outputs', {}).items():
+        if hashes.path_hash(path) != recorded_hash:
+            return False
+    return True
+
+def clear_outputs(stage):
+    """Delete the stage's declared outputs left over from an earlier run."""
+    for path in stage.outputs + ([stage.stdout] if stage.stdout else []):
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+
+def run_stage(stage):
+    """Run a stage's command, writing its stdout to a file if requested."""
+    # Otherwise a command that fails but exits 0 would have the old outputs recorded as its own
+    clear_outputs(stage)
+    for path in stage.outputs + ([stage.stdout] if stage.stdout else []):
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+    os.makedirs(stage.workdir, exist_ok=True)
+
+    # Make "ptp" stages work from a checkout that has not been pip-installed
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SCRIPT_DIR, env.get('PYTHONPATH')]))
+
+    start = time.time()
+    if stage.stdout:
+        with open(stage.stdout, 'w') as out:
+            result = subprocess.run(stage.command, cwd=stage.workdir, stdout=out, env=env)
+    else:
+        result = subprocess.run(stage.command, cwd=stage.workdir, env=env)
+    return result.returncode, time.time() - start
+
+def record_success(stage, key, state_dir, hashes):
+    """Store the stage key and output hashes so the next run can skip it."""
+    outputs = stage.outputs + ([stage.stdout] if stage.stdout else [])
+    missing = [path for path in outputs if not os.path.exists(path)]
+    if missing:
+        raise PipelineError(f"Stage '{stage.name}' did not create: {', '.join(missing)}")
+
+    state = {
+        'key': key,
+        'command': stage.command,
+        'outputs': {path: hashes.path_hash(path) for path in outputs},
+        'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with open(os.path.join(state_dir, f"{stage.name}.json"), 'w') as f:
+        json.dump(state, f, indent=2)
+
+def run_pipeline(config_file, workers=None, force=(), dry_run=False):
+    """
+    Run every stage that is not cached, in dependency order.
+
+    Returns:
+        Dict mapping stage names to 'cached', 'ran', 'would run', 'failed' or 'blocked'
+    """
+    with profiling.stage('plan') as plan:
+        config = load_config(config_file)
+        base_dir = os.path.dirname(os.path.abspath(config_file))
+        settings = config.get('settings', {})
+        stages = build_stages(config, base_dir)
+        plan.add(records=len(stages), bytes=os.path.getsize(config_file))
+
+    for name in force:
+        if name not in stages:
+            raise PipelineError(f"Unknown stage '{name}'")
+
+    state_dir = os.path.join(base_dir, settings.get('cache_dir', '.pipeline_cache'))
+    os.makedirs(state_dir, exist_ok=True)
+    hashes = HashCache(os.path.join(state_dir, 'file_hashes.json'))
+    workers = workers or settings.get('workers', 1)
+
+    status = {}
+    pending = set(stages)
+    running = {}
+
+    def dependency_states(name):
+        return {status.get(dep) for dep in stages[name].dependencies}
+
+    # Stage commands run as subprocesses, so their CPU time shows up as
+    # children_cpu_seconds; run them with --profile themselves for a breakdown
+    with profiling.stage('execute') as execute, ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            progressed = False
+            for name in sorted(pending):
+                stage = stages[name]
+                states = dependency_states(name)
+                if states & {'failed', 'blocked'}:
+                    status[name] = 'blocked'
+                elif 'would run' in states:
+                    # In a dry run everything downstream of a stale stage is stale too
+                    status[name] = 'would run'
+                elif states <= {'cached', 'ran'}:
+                    key = stage.cache_key(hashes)
+                    if name not in force and is_cached(stage, key, state_dir, hashes):
+                        status[name] = 'cached'
+                        print(f"[cached] {name}")
+                    elif dry_run:
+                        status[name] = 'would run'
+                        print(f"[stale]  {name}")
+                    else:
+                        print(f"[run]    {name}: {' '.join(stage.command)}")
+                        running[executor.submit(run_stage, stage)] = (name, key)
+                        status[name] = 'running'
+                else:
+                    continue
+                pending.discard(name)
+                progressed = True
+
+            if not running:
+                if not progressed:
+                    break
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = running.pop(future)
+                try:
+                    returncode, elapsed = future.result()
+                    if returncode != 0:
+                        raise PipelineError(f"exit status {returncode}")
+                    record_success(stages[name], key, state_dir, hashes)
+                    status[name] = 'ran'
+                    execute.add(records=1)
+                    print(f"[done]   {name} ({elapsed:.1f}s)")
+                except (PipelineError, OSError) as e:
+                    status[name] = 'failed'
+                    print(f"[failed] {name}: {e}", file=sys.stderr)
+
+    hashes.save()
+    for name in pending:
+        status[name] = 'blocked'
+    return status
+
+def add_arguments(parser):
+    parser.add_argument('config', help='Pipeline definition (TOML or YAML)')
+    parser.add_argument('--workers', type=int, help='Number of stages to run at the same time')
+    parser.add_argument('--force', action='append', default=[], metavar='STAGE',
+                        help='Re-run this stage even if cached; repeat for several stages')
+    parser.add_argument('--dry-run', action='store_true', help='Only report which stages would run')
+
+def run(args):
+    try:
+        status = run_pipeline(args.config, workers=args.workers, force=args.force, dry_run=args.dry_run)
+    except (PipelineError, OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        sys.exit(1)
+
+    print("\nPipeline summary:")
+    for name in sorted(status):
+        print(f"- {name}: {status[name]}")
+
+    if any(value in ('failed', 'blocked') for value in status.values()):
+        sys.exit(1)
+
+def main(argv=None):
+    from .cli import run_command
+    run_command('run-pipeline', argv)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# Kept so existing workflows can still call this script directly.
+# The code lives in ptpipeline/run_pipeline.py and is also available as: ptp run-pipeline
+
+from ptpipeline.run_pipeline import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""T-plot naming checks for filter_cleaveland_results."""
+
+from ptpipeline.filter_cleaveland_results import parse_cleaveland_output, tplot_name, write_output
+
+# A CleaveLand4 record written without -o: no T-Plot file line, only the query
+RECORD_WITHOUT_TPLOT = """SiteID: Sevir.1G015900.1:1032
+MFE of perfect match: -40.1
+MFE of this site: -32.5
+MFEratio: 0.81
+Allen et al. score: 2
+Paired Regions
+    1022-1042
+Unpaired Regions
+    1020-1021
+Degardome data file: degradome_density.txt
+Degardome Category: 0
+Degardome p-value: 0.01
+5' UCUGGAUGAAGACUCGCCAUA 3' Transcript: Sevir.1G015900.1:1022-1042
+   |||||||||||||||||||||
+3' AGACCUACUUCUGAGCGGUAU 5' Query: Chr09_39038
+
+Position\tReads\tCategory
+1032\t120\t0
+"""
+
+def test_refiltering_keeps_tplot_names(tmp_path):
+    full_results = tmp_path / 'full_results.txt'
+    full_results.write_text(RECORD_WITHOUT_TPLOT)
+    first = parse_cleaveland_output(str(full_results))
+    assert [tplot_name(r) for r in first] == ['Chr09_39038_Sevir.1G015900.1_1032_TPlot']
+
+    # Filtering filtered_results.txt again must draw the same file names
+    filtered = tmp_path / 'filtered_results.txt'
+    write_output(first, str(filtered))
+    second = parse_cleaveland_output(str(filtered))
+    assert [tplot_name(r) for r in second] == [tplot_name(r) for r in first]
+
+def test_tplot_name_strips_only_image_suffixes():
+    record = {'tplot_file': 'cleaveland_results/Chr09_39038_Sevir.1G015900.1_1032_TPlot.pdf'}
+    assert tplot_name(record) == 'Chr09_39038_Sevir.1G015900.1_1032_TPlot'
+    record = {'tplot_file': 'Chr09_39038_Sevir.1G015900.1_1032_TPlot'}
+    assert tplot_name(record) == 'Chr09_39038_Sevir.1G015900.1_1032_TPlot'
@@ -0,0 +1,18 @@
+"""Startup-time regression checks for the ptp command line (see check_startup_time.py)."""
+
+import pytest
+
+from check_startup_time import heavy_imports, time_command
+from ptpipeline.cli import COMMANDS
+
+# Loose on purpose: eager imports of pandas or matplotlib cost seconds on the
+# cluster filesystem, while shared CI machines can be slow for other reasons
+MAX_HELP_SECONDS = 2.0
+
+@pytest.mark.parametrize('command', sorted(COMMANDS))
+def test_help_imports_no_heavy_modules(command):
+    assert heavy_imports(command) == set()
+
+@pytest.mark.parametrize('command', sorted(COMMANDS))
+def test_help_starts_quickly(command):
+    assert time_command(command, repeats=3) < MAX_HELP_SECONDS